@@ -16,6 +16,7 @@ def create_production_files():
 Production settings for DrowsiSense deployment
 """
 import os
+import django
 import dj_database_url
 from .settings import *
 
@@ -38,6 +39,19 @@ DATABASES = {
     )
 }
 
+# Cap total PostgreSQL connections with the psycopg3 pool (Django >= 5.1).
+# The pool replaces persistent per-thread connections, so CONN_MAX_AGE is 0.
+if (
+    DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql'
+    and django.VERSION >= (5, 1)
+):
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+        'min_size': 2,
+        'max_size': 4,
+        'timeout': 10,
+    }
+
 # Static files configuration
 STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
@@ -46,6 +60,9 @@ STATICFILES_DIRS = [BASE_DIR / 'static']
 # Use WhiteNoise for static files
 MIDDLEWARE.insert(1, 'whitenoise.middleware.WhiteNoiseMiddleware')
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# Serve the .br/.gz files built by collectstatic with far-future caching
+WHITENOISE_MAX_AGE = 31536000
+WHITENOISE_USE_FINDERS = False
 
 # Security settings
 SECURE_SSL_REDIRECT = not DEBUG
@@ -94,12 +111,21 @@ CORS_ALLOWED_ORIGINS = [
     "https://drowsisense-production.up.railway.app",
 ]
 
-# Cache configuration
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+# Cache configuration - Redis when the Railway Redis plugin injects
+# REDIS_URL; otherwise keep Django's local-memory cache and database
+# sessions, so a missing Redis can't break every request
+REDIS_URL = os.environ.get('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'TIMEOUT': 3600,
+        }
     }
-}
+    
+    # Serve sessions from the cache, falling back to the database
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
 
 print("🚀 Production settings loaded successfully!")
 '''
@@ -116,7 +142,7 @@ print("🚀 Production settings loaded successfully!")
     "builder": "NIXPACKS"
   },
   "deploy": {
-    "startCommand": "python manage.py migrate && python manage.py collectstatic --noinput && gunicorn drowsiness_project.wsgi:application --bind 0.0.0.0:$PORT",
+    "startCommand": "python manage.py migrate && python manage.py collectstatic --noinput --clear && python manage.py check_static_compression && gunicorn drowsiness_project.wsgi:application --bind 0.0.0.0:$PORT --worker-class gthread --workers 1 --threads 8 --preload",
     "restartPolicyType": "ON_FAILURE",
     "restartPolicyMaxRetries": 10
   }
@@ -127,8 +153,9 @@ print("🚀 Production settings loaded successfully!")
     print(" Created: railway.json")
     
     # 3. Create Procfile
-    procfile_content = '''web: gunicorn drowsiness_project.wsgi:application --bind 0.0.0.0:$PORT
-worker: python manage.py runserver'''
+    # One worker: the monitoring session and its video feed live in-process,
+    # so a second worker would answer /video-feed/ without any frames
+    procfile_content = '''web: gunicorn drowsiness_project.wsgi:application --bind 0.0.0.0:$PORT --worker-class gthread --workers 1 --threads 8 --preload'''
     
     with open('Procfile', 'w') as f:
         f.write(procfile_content)
@@ -143,8 +170,9 @@ worker: python manage.py runserver'''
     additional_requirements = '''
 # Production requirements
 gunicorn==21.2.0
-psycopg2-binary==2.9.9
+psycopg[binary,pool]==3.1.18
 whitenoise==6.6.0
+brotli==1.1.0
 dj-database-url==2.1.0
 '''
     
@@ -155,14 +183,13 @@ dj-database-url==2.1.0
     # 6. Create health check view
     health_check_view = '''
 # Add this to drowsiness_app/views_refactored.py
+# (/health/ itself is answered in wsgi.py before Django runs)
 
 from django.http import JsonResponse
-from django.views.decorators.cache import cache_page
 from django.utils import timezone
 
-@cache_page(60)
 def health_check(request):
-    """Health check endpoint for monitoring"""
+    """Detailed health check endpoint for monitoring"""
     return JsonResponse({
         'status': 'healthy',
         'version': '2.0',
@@ -225,6 +252,7 @@ def health_check(request):
 4. Choose "Deploy from GitHub repo"
 5. Select your DrowsiSense repository
 6. Add PostgreSQL database service
+7. Add Redis service (provides REDIS_URL for the shared cache)
 
 ## Environment Variables to Set in Railway:
 ```
@@ -233,6 +261,7 @@ SECRET_KEY = your-super-secret-key-generate-new-one
 PORT = 8000
 EMAIL_HOST_USER = your-email@gmail.com (optional)
 EMAIL_HOST_PASSWORD = your-app-password (optional)
+REDIS_URL = provided automatically by the Redis service
 ```
 
 ## After Deployment:
@@ -273,7 +302,23 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 
                      'drowsiness_project.settings_production')
 
-application = get_wsgi_application()
+django_application = get_wsgi_application()
+
+# Railway pings /health/ often - answer it without running the middleware stack
+HEALTH_CHECK_PATH = '/health/'
+HEALTH_CHECK_BODY = b'{"status": "healthy"}'
+HEALTH_CHECK_HEADERS = [
+    ('Content-Type', 'application/json'),
+    ('Content-Length', str(len(HEALTH_CHECK_BODY))),
+]
+
+
+def application(environ, start_response):
+    """WSGI entry point with a health check fast path"""
+    if environ.get('PATH_INFO') == HEALTH_CHECK_PATH:
+        start_response('200 OK', HEALTH_CHECK_HEADERS)
+        return [HEALTH_CHECK_BODY]
+    return django_application(environ, start_response)
 '''
     
     with open('drowsiness_project/wsgi.py', 'w') as f:
@@ -308,10 +353,6 @@ def main():
     except Exception as e:
         print(f"❌ Error creating deployment files: {e}")
 
-if __name__ == "__main__":
-    main()
-'''
-
 def create_secret_key_generator():
     """Create a script to generate Django secret key"""
     key_generator = '''#!/usr/bin/env python
@@ -1,6 +1,30 @@
+import logging
+import os
+
 from django.apps import AppConfig
 
 
+logger = logging.getLogger(__name__)
+
+
 class DrowsinessAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'drowsiness_app'
+
+    def ready(self):
+        # Load detector models once in the serving process. Under gunicorn
+        # --preload this runs in the master, so forked workers share them.
+        # Management commands (migrate, collectstatic) skip the load.
+        serving = (
+            os.environ.get('RUN_MAIN')
+            or os.environ.get('GUNICORN_CMD_ARGS')
+            or os.environ.get('SERVER_SOFTWARE', '').startswith('gunicorn')
+        )
+        if not serving:
+            return
+
+        from .detection_factory import get_detector
+        try:
+            get_detector()
+        except Exception as e:
+            logger.warning(f"Detector preload failed: {e}")
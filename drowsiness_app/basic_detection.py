@@ -7,6 +7,9 @@ import numpy as np
 
 
 class BasicOpenCVDetector:
+    # Callers should pass precomputed gray/small frames
+    uses_gray = True
+    
     def __init__(self):
         # Initialize OpenCV cascade classifiers
         self.face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
@@ -21,15 +24,26 @@ class BasicOpenCVDetector:
         # Previous measurements for comparison
         self.prev_eye_ratio = 0.3
         
-    def detect_drowsiness(self, frame):
+    def detect_drowsiness(self, frame, gray=None, small=None):
         """
         Basic drowsiness detection using OpenCV only
+        Args:
+            frame: Video frame (BGR format)
+            gray: Optional precomputed grayscale of frame
+            small: Optional half-size grayscale (cv2.pyrDown of gray)
         Returns: (is_drowsy, is_yawning, frame_with_annotations)
+        Annotations are drawn on `frame` itself; callers that reuse the
+        input buffer must consume the result before the next read
         """
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if gray is None:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
         
-        # Detect faces
-        faces = self.face_cascade.detectMultiScale(gray, 1.3, 5)
+        # Detect faces, on the half-size image when one is provided
+        if small is not None:
+            faces = self.face_cascade.detectMultiScale(small, 1.3, 5)
+            faces = [(2 * x, 2 * y, 2 * w, 2 * h) for (x, y, w, h) in faces]
+        else:
+            faces = self.face_cascade.detectMultiScale(gray, 1.3, 5)
         
         is_drowsy = False
         is_yawning = False
@@ -3,42 +3,103 @@ Detection Engine - Improved task execution with better architecture
 """
 import asyncio
 import logging
-from typing import Dict, Any, Optional
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterator, Optional
 import cv2
-try:
-    import pygame.mixer
-    PYGAME_AVAILABLE = True
-except ImportError:
+import numpy as np
+# No audio device in the Railway container - don't load SDL at all
+if os.environ.get('RAILWAY_ENVIRONMENT'):
     PYGAME_AVAILABLE = False
-import os
-from asgiref.sync import sync_to_async
+else:
+    try:
+        import pygame.mixer
+        PYGAME_AVAILABLE = True
+    except ImportError:
+        PYGAME_AVAILABLE = False
+from pathlib import Path
 
 from ..detection_factory import get_detector
 from ..services.alert_service import alert_service
 from ..core.exceptions import DetectionError, CameraError, AudioError
 from ..models import DriverProfile
+from ..utils.frame_stream import frame_stream
 
 
 logger = logging.getLogger(__name__)
 
+# Alert sound shipped with the project static files
+_AUDIO_PATH = Path(__file__).resolve().parents[2] / "static" / "music.wav"
+
+# Spoken alert pre-rendered by `manage.py render_tts_alert`
+_TTS_PATH = _AUDIO_PATH.with_name("tts_drowsy.wav")
+
+# pygame.mixer is process-wide: initialize it once for all engines
+_AUDIO_READY = False
+_AUDIO_LOCK = threading.Lock()
+_TTS_SOUND = None
+
 
 class DetectionEngine:
     """
     Main detection engine that orchestrates the monitoring process
     """
     
+    # Stale frame draining: at most this many grabs per read, and a grab
+    # faster than half a frame period (at 30 FPS) came from the driver queue
+    MAX_FRAME_GRABS = 4
+    BUFFERED_GRAB_SECONDS = 0.5 / 30
+    
+    FRAME_WIDTH = 640
+    FRAME_HEIGHT = 480
+    
+    # Consecutive yawning frames before an alert (lower than for eyes)
+    YAWN_ALERT_FRAMES = 3
+    
+    # Adaptive striding: after this many consecutive clear detections,
+    # only every IDLE_STRIDE-th frame is decoded and run through the detector
+    IDLE_FRAMES_BEFORE_STRIDE = 300
+    IDLE_STRIDE = 2
+    
+    # Alert dispatch: queue depth and minimum gap between same-type alerts
+    ALERT_QUEUE_SIZE = 8
+    ALERT_COOLDOWN_SECONDS = 10
+    
     def __init__(self):
         self.detector = None
         self.is_running = False
         self.camera = None
         self.audio_initialized = False
+        self._tts_sound = None
         
         # Detection state
-        self.consecutive_drowsy_frames = 0
-        self.consecutive_yawn_frames = 0
         self.last_drowsy_alert_time = 0
         self.last_yawn_alert_time = 0
         
+        # Alert side effects (DB, email, audio) run off the detection loop
+        self._alert_queue: Optional[asyncio.Queue] = None
+        self._alert_worker_task: Optional[asyncio.Task] = None
+        
+        # Blocking OpenCV work runs here, off the event loop
+        self._cv_executor: Optional[ThreadPoolExecutor] = None
+        
+        # Persistent capture buffer; frames are decoded into it in place
+        self._frame_buf = None
+        
+        # Resize only when the camera ignores the requested resolution
+        self._needs_resize: Optional[bool] = None
+        self._resize_buf = None
+        
+        # Adaptive frame striding state
+        self._stride = 1
+        self._idle_frames = 0
+        
+        # Luminance buffers shared with the detector
+        self._gray_buf = None
+        self._small_buf = None
+        
         # Configuration
         self.config = {}
     
@@ -57,6 +118,22 @@ class DetectionEngine:
             if not self.detector:
                 raise DetectionError("Failed to initialize detector")
             
+            # Single worker: the camera handle must stay on one thread
+            self._cv_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="drowsisense-cv"
+            )
+            
+            self._frame_buf = np.empty(
+                (self.FRAME_HEIGHT, self.FRAME_WIDTH, 3), dtype=np.uint8
+            )
+            self._resize_buf = np.empty(
+                (self.FRAME_HEIGHT, self.FRAME_WIDTH, 3), dtype=np.uint8
+            )
+            self._gray_buf = np.empty((self.FRAME_HEIGHT, self.FRAME_WIDTH), dtype=np.uint8)
+            self._small_buf = np.empty(
+                (self.FRAME_HEIGHT // 2, self.FRAME_WIDTH // 2), dtype=np.uint8
+            )
+            
             # Initialize camera
             await self._initialize_camera(config.get('camera_index', 0))
             
@@ -87,6 +164,9 @@ class DetectionEngine:
         
         try:
             self.is_running = True
+            frame_stream.start(driver_profile.user_id)
+            self._alert_queue = asyncio.Queue(maxsize=self.ALERT_QUEUE_SIZE)
+            self._alert_worker_task = asyncio.create_task(self._alert_worker())
             await self._monitoring_loop(driver_profile, settings)
             
         except asyncio.CancelledError:
@@ -102,11 +182,25 @@ class DetectionEngine:
         try:
             self.is_running = False
             
+            if self._alert_worker_task:
+                self._alert_worker_task.cancel()
+                self._alert_worker_task = None
+            
+            if self._cv_executor:
+                # Wait for the in-flight OpenCV call before releasing the
+                # camera, without blocking the event loop meanwhile
+                executor, self._cv_executor = self._cv_executor, None
+                await asyncio.get_running_loop().run_in_executor(
+                    None, executor.shutdown, True
+                )
+            
             if self.camera:
                 self.camera.release()
                 self.camera = None
             
-            cv2.destroyAllWindows()
+            # Release any stream consumers so they can see we stopped
+            frame_stream.stop()
+            
             logger.info("Monitoring stopped successfully")
             
         except Exception as e:
@@ -120,9 +214,10 @@ class DetectionEngine:
                 raise CameraError(f"Cannot open camera {camera_index}")
             
             # Set camera properties for better performance
-            self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-            self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+            self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, self.FRAME_WIDTH)
+            self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, self.FRAME_HEIGHT)
             self.camera.set(cv2.CAP_PROP_FPS, 30)
+            self.camera.set(cv2.CAP_PROP_BUFFERSIZE, 1)
             
             logger.info(f"Camera {camera_index} initialized successfully")
             
@@ -131,20 +226,32 @@ class DetectionEngine:
     
     async def _initialize_audio(self) -> None:
         """Initialize audio system"""
+        global _AUDIO_READY, _TTS_SOUND
         try:
             if PYGAME_AVAILABLE:
-                pygame.mixer.init()
-                
-                # Try to load audio file
-                base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-                audio_path = os.path.join(base_dir, "static", "music.wav")
-                
-                if os.path.exists(audio_path):
-                    pygame.mixer.music.load(audio_path)
-                    self.audio_initialized = True
-                    logger.info("Audio system initialized successfully")
-                else:
-                    logger.warning(f"Audio file not found: {audio_path}")
+                with _AUDIO_LOCK:
+                    if _AUDIO_READY:
+                        self.audio_initialized = True
+                        self._tts_sound = _TTS_SOUND
+                        return
+                    
+                    pygame.mixer.init()
+                    
+                    # Try to load audio file
+                    if _AUDIO_PATH.exists():
+                        pygame.mixer.music.load(str(_AUDIO_PATH))
+                        _AUDIO_READY = True
+                        self.audio_initialized = True
+                        logger.info("Audio system initialized successfully")
+                    else:
+                        logger.warning(f"Audio file not found: {_AUDIO_PATH}")
+                    
+                    # Spoken alert plays on its own channel alongside the music
+                    if _TTS_PATH.exists():
+                        _TTS_SOUND = pygame.mixer.Sound(str(_TTS_PATH))
+                        self._tts_sound = _TTS_SOUND
+                    else:
+                        logger.info(f"Spoken alert not rendered: {_TTS_PATH}")
             else:
                 logger.info("Pygame not available - audio alerts disabled")
                 self.audio_initialized = False
@@ -165,59 +272,163 @@ class DetectionEngine:
             driver_profile: Driver profile instance
             settings: Detection settings
         """
-        ear_threshold = settings.get('ear_threshold', 0.3)
-        ear_frames = settings.get('ear_frames', 30)
-        yawn_threshold = settings.get('yawn_threshold', 20)
+        # Hoisted per-session constants; EAR/MAR thresholds live in the detector
+        ear_frames = int(settings.get('ear_frames', 30))
+        yawn_frames = self.YAWN_ALERT_FRAMES
+        drowsy_count = 0
+        yawn_count = 0
+        ear_limit = ear_frames
+        frame_idx = 0
+        loop = asyncio.get_running_loop()
         
         while self.is_running:
             try:
-                # Read frame
-                ret, frame = self.camera.read()
+                # Idle striding: advance the camera without decoding
+                frame_idx += 1
+                if frame_idx % self._stride:
+                    await loop.run_in_executor(self._cv_executor, self.camera.grab)
+                    continue
+                
+                # Read frame (blocks until the camera delivers one)
+                ret, frame = await loop.run_in_executor(self._cv_executor, self._read_frame)
                 if not ret or frame is None:
                     logger.warning("No frame received from camera")
                     await asyncio.sleep(0.1)
                     continue
                 
-                # Resize frame for better performance
-                frame = cv2.resize(frame, (640, 480))
-                
                 # Perform detection
-                is_drowsy, is_yawning, annotated_frame = self.detector.detect_drowsiness(frame)
+                is_drowsy, is_yawning, annotated_frame = await loop.run_in_executor(
+                    self._cv_executor, self._detect, frame
+                )
                 
-                # Handle drowsiness detection
-                if is_drowsy:
-                    self.consecutive_drowsy_frames += 1
-                    if self.consecutive_drowsy_frames >= ear_frames:
-                        await self._handle_drowsiness_alert(driver_profile)
-                        self.consecutive_drowsy_frames = 0  # Reset after alert
-                else:
-                    self.consecutive_drowsy_frames = 0
+                # Consecutive-frame counters: +1 on a hit, back to 0 on a miss
+                drowsy_count = (drowsy_count + 1) * is_drowsy
+                yawn_count = (yawn_count + 1) * is_yawning
                 
-                # Handle yawn detection
-                if is_yawning:
-                    self.consecutive_yawn_frames += 1
-                    if self.consecutive_yawn_frames >= 3:  # Lower threshold for yawning
-                        await self._handle_yawn_alert(driver_profile)
-                        self.consecutive_yawn_frames = 0  # Reset after alert
+                # Back to full rate on any hit; halve it once clearly awake.
+                # Each detected frame stands for `stride` camera frames.
+                if is_drowsy or is_yawning:
+                    self._idle_frames = 0
+                    if self._stride != 1:
+                        self._stride = 1
+                        ear_limit = ear_frames
                 else:
-                    self.consecutive_yawn_frames = 0
+                    self._idle_frames += 1
+                    if self._stride == 1 and self._idle_frames > self.IDLE_FRAMES_BEFORE_STRIDE:
+                        self._stride = self.IDLE_STRIDE
+                        ear_limit = max(1, ear_frames // self._stride)
                 
-                # Display frame
-                cv2.imshow("DrowsiSense - Driver Monitoring", annotated_frame)
+                # Handle drowsiness detection
+                if drowsy_count >= ear_limit:
+                    await self._handle_drowsiness_alert(driver_profile)
+                    drowsy_count = 0  # Reset after alert
                 
-                # Check for quit key
-                key = cv2.waitKey(1) & 0xFF
-                if key == ord('q'):
-                    break
+                # Handle yawn detection
+                if yawn_count >= yawn_frames:
+                    await self._handle_yawn_alert(driver_profile)
+                    yawn_count = 0  # Reset after alert
                 
-                # Control frame rate
-                await asyncio.sleep(0.033)  # ~30 FPS
+                # Publish frame to stream consumers (headless - no HighGUI)
+                await self._publish_frame(annotated_frame)
                 
             except Exception as e:
                 logger.error(f"Error in monitoring loop: {e}")
                 await asyncio.sleep(0.1)  # Brief pause before continuing
     
+    def _read_frame(self):
+        """Read and size a camera frame (blocking - runs in the CV executor)"""
+        # Drop frames queued while detection was busy so alerts are based
+        # on the newest frame; grab() only advances, it does not decode
+        for _ in range(self.MAX_FRAME_GRABS):
+            started = time.monotonic()
+            if not self.camera.grab():
+                return False, None
+            if time.monotonic() - started > self.BUFFERED_GRAB_SECONDS:
+                break  # Blocked for a fresh frame - nothing left queued
+        
+        # Decode into the persistent buffer. The detector may annotate it in
+        # place, which is safe because detection and JPEG encoding finish on
+        # this executor before the next read overwrites it
+        ret, frame = self.camera.retrieve(self._frame_buf)
+        if ret and frame is not None:
+            if self._needs_resize is None:
+                # Check once whether the camera honoured the capture size
+                self._needs_resize = frame.shape[:2] != (self.FRAME_HEIGHT, self.FRAME_WIDTH)
+            if self._needs_resize:
+                frame = cv2.resize(
+                    frame, (self.FRAME_WIDTH, self.FRAME_HEIGHT), dst=self._resize_buf
+                )
+        return ret, frame
+    
+    def _detect(self, frame):
+        """Run the detector on a frame (blocking - runs in the CV executor)"""
+        # Convert to grayscale once and hand the detector a half-size
+        # pyramid level for face search, so it skips its own conversion.
+        # Detectors that never read them (Face Mesh, demo mode) skip both
+        if not getattr(self.detector, 'uses_gray', False):
+            return self.detector.detect_drowsiness(frame)
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._gray_buf)
+        small = cv2.pyrDown(gray, dst=self._small_buf)
+        return self.detector.detect_drowsiness(frame, gray=gray, small=small)
+    
+    async def _publish_frame(self, frame) -> None:
+        """Encode frame as JPEG and hand it to stream consumers"""
+        # Skip the encode entirely when no client is watching
+        if not frame_stream.clients:
+            return
+        
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._cv_executor, frame_stream.publish_frame, frame)
+    
+    def stream_frames(self) -> Optional[Iterator[bytes]]:
+        """
+        Yield multipart MJPEG chunks as new frames are published
+        Returns: Sync iterator suitable for StreamingHttpResponse, or None
+            when the viewer limit is reached
+        """
+        return frame_stream.subscribe()
+    
     async def _handle_drowsiness_alert(self, driver_profile: DriverProfile) -> None:
+        """Queue a drowsiness alert unless one was raised recently"""
+        now = time.monotonic()
+        if now - self.last_drowsy_alert_time < self.ALERT_COOLDOWN_SECONDS:
+            return
+        self.last_drowsy_alert_time = now
+        self._enqueue_alert('drowsiness', driver_profile, now)
+    
+    async def _handle_yawn_alert(self, driver_profile: DriverProfile) -> None:
+        """Queue a yawn alert unless one was raised recently"""
+        now = time.monotonic()
+        if now - self.last_yawn_alert_time < self.ALERT_COOLDOWN_SECONDS:
+            return
+        self.last_yawn_alert_time = now
+        self._enqueue_alert('yawning', driver_profile, now)
+    
+    def _enqueue_alert(self, alert_type: str, driver_profile: DriverProfile, ts: float) -> None:
+        """Hand an alert to the worker without blocking the detection loop"""
+        try:
+            self._alert_queue.put_nowait({
+                'type': alert_type,
+                'profile': driver_profile,
+                'ts': ts,
+            })
+        except asyncio.QueueFull:
+            logger.warning(f"Alert queue full - dropping {alert_type} alert")
+    
+    async def _alert_worker(self) -> None:
+        """Consume queued alerts and run their side effects"""
+        handlers = {
+            'drowsiness': self._process_drowsiness_alert,
+            'yawning': self._process_yawn_alert,
+        }
+        while True:
+            item = await self._alert_queue.get()
+            try:
+                await handlers[item['type']](item['profile'])
+            finally:
+                self._alert_queue.task_done()
+    
+    async def _process_drowsiness_alert(self, driver_profile: DriverProfile) -> None:
         """Handle drowsiness detection"""
         try:
             # Create alert
@@ -243,7 +454,7 @@ class DetectionEngine:
         except Exception as e:
             logger.error(f"Error handling drowsiness alert: {e}")
     
-    async def _handle_yawn_alert(self, driver_profile: DriverProfile) -> None:
+    async def _process_yawn_alert(self, driver_profile: DriverProfile) -> None:
         """Handle yawn detection"""
         try:
             # Create alert
@@ -271,29 +482,12 @@ class DetectionEngine:
             else:
                 logger.info("Audio alert skipped - pygame not available")
             
-            # Optional: Text-to-speech
-            await self._play_tts_alert()
+            # Optional: pre-rendered text-to-speech
+            if self._tts_sound is not None:
+                self._tts_sound.play()
             
         except Exception as e:
             logger.warning(f"Audio alert failed: {e}")
-    
-    async def _play_tts_alert(self) -> None:
-        """Play text-to-speech alert"""
-        try:
-            import os
-            if os.name == 'nt':  # Windows
-                try:
-                    import pyttsx3
-                    engine = pyttsx3.init()
-                    engine.say("Alert: Drowsiness detected!")
-                    engine.runAndWait()
-                except ImportError:
-                    logger.debug("pyttsx3 not available")
-            else:  # Linux/Mac
-                await sync_to_async(os.system)('espeak "Alert: Drowsiness detected!"')
-                
-        except Exception as e:
-            logger.debug(f"TTS failed: {e}")
 
 
 # Factory function
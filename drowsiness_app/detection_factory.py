@@ -3,9 +3,24 @@ Detection Factory - automatically chooses the best available detection method
 Fallback order: dlib -> MediaPipe -> basic OpenCV
 """
 import logging
+import os
+from functools import lru_cache
+from importlib.util import find_spec
 
 logger = logging.getLogger(__name__)
 
+# Deployment environment is fixed for the life of the process
+_IS_PROD = (
+    bool(os.environ.get('RAILWAY_ENVIRONMENT'))
+    or os.environ.get('DJANGO_SETTINGS_MODULE', '').endswith('production')
+)
+
+
+def _modules_available(*names):
+    """Probe module availability from loader metadata without importing"""
+    return all(find_spec(name, __package__) is not None for name in names)
+
+
 class DetectionFactory:
     """Factory to create the best available detector"""
     
@@ -14,39 +29,52 @@ class DetectionFactory:
         """Create the best available detector"""
         
         # Check if we're in production environment
-        import os
-        if os.environ.get('RAILWAY_ENVIRONMENT') or os.environ.get('DJANGO_SETTINGS_MODULE', '').endswith('production'):
+        if _IS_PROD:
             logger.info("Using production detector for Railway deployment")
             from .detection_production import get_production_detector
             return get_production_detector()
         
-        # Try dlib first (original implementation - for local development)
-        try:
-            import dlib
-            from .original_detection import DlibDrowsinessDetector  # We'll create this
-            logger.info("Using dlib-based detection")
-            return DlibDrowsinessDetector()
-        except ImportError:
-            logger.warning("dlib not available, trying MediaPipe")
+        # Try dlib first (original implementation - for local development).
+        # find_spec skips absent backends cheaply; an installed but broken
+        # one (missing libGL, ABI mismatch) fails here and falls through
+        if _modules_available('dlib', '.original_detection'):  # We'll create this
+            try:
+                from .original_detection import DlibDrowsinessDetector
+                detector = DlibDrowsinessDetector()
+                logger.info("Using dlib-based detection")
+                return detector
+            except Exception as e:
+                logger.warning(f"dlib detector failed to load: {e}")
+        logger.warning("dlib not available, trying MediaPipe")
             
         # Try MediaPipe
-        try:
-            from .mediapipe_detection import MediaPipeDrowsinessDetector
-            logger.info("Using MediaPipe-based detection")
-            return MediaPipeDrowsinessDetector()
-        except ImportError:
-            logger.warning("MediaPipe not available, using production detector")
+        if _modules_available('mediapipe', 'scipy'):
+            try:
+                from .mediapipe_detection import MediaPipeDrowsinessDetector
+                detector = MediaPipeDrowsinessDetector()
+                logger.info("Using MediaPipe-based detection")
+                return detector
+            except Exception as e:
+                logger.warning(f"MediaPipe detector failed to load: {e}")
+        logger.warning("MediaPipe not available, using production detector")
             
         # Fallback to production detector
-        try:
-            from .detection_production import get_production_detector
-            logger.info("Using production detector as fallback")
-            return get_production_detector()
-        except ImportError:
-            logger.error("No detection methods available!")
-            raise ImportError("No computer vision libraries available for detection")
+        if _modules_available('cv2', 'numpy'):
+            try:
+                from .detection_production import get_production_detector
+                logger.info("Using production detector as fallback")
+                return get_production_detector()
+            except ImportError as e:
+                logger.warning(f"Production detector failed to load: {e}")
+        
+        logger.error("No detection methods available!")
+        raise ImportError("No computer vision libraries available for detection")
 
 # Convenience function
+@lru_cache(maxsize=1)
 def get_detector():
-    """Get a detector instance"""
+    """
+    Get the process-wide detector instance
+    Models are loaded once per process and shared by all callers
+    """
     return DetectionFactory.create_detector()
\ No newline at end of file
@@ -5,6 +5,9 @@ Uses MediaPipe and OpenCV for Railway deployment
 import cv2
 import numpy as np
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +19,144 @@ except ImportError:
     MEDIAPIPE_AVAILABLE = False
     logger.warning("⚠️ MediaPipe not available, using basic detection")
 
+try:
+    import numba
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Fallback decorator - run the plain Python function"""
+        return lambda func: func
+
+
+# Face Mesh landmark indices, ordered p0..p5 for the 6-point EAR
+# (corner, top, top, corner, bottom, bottom)
+LEFT_EYE_INDICES = np.array([33, 160, 158, 133, 153, 144], dtype=np.int32)
+RIGHT_EYE_INDICES = np.array([362, 385, 387, 263, 373, 380], dtype=np.int32)
+# Inner lips ordered p0..p7 (corner, 3 upper, corner, 3 lower)
+MOUTH_INDICES = np.array([78, 81, 13, 311, 308, 402, 14, 178], dtype=np.int32)
+# Only these landmarks are copied out of each Face Mesh result
+LANDMARK_SUBSET = np.concatenate(
+    (LEFT_EYE_INDICES, RIGHT_EYE_INDICES, MOUTH_INDICES)
+)
+_LANDMARK_SUBSET_LIST = LANDMARK_SUBSET.tolist()
+# Positions of each feature within the subset array
+_LEFT_EYE = np.arange(0, 6, dtype=np.int32)
+_RIGHT_EYE = np.arange(6, 12, dtype=np.int32)
+_MOUTH = np.arange(12, 20, dtype=np.int32)
+
+
+@njit(cache=True, fastmath=True)
+def _distance(lms, a, b):
+    """Euclidean distance between two landmarks in the image plane"""
+    dx = lms[a, 0] - lms[b, 0]
+    dy = lms[a, 1] - lms[b, 1]
+    return np.sqrt(dx * dx + dy * dy)
+
+
+@njit(cache=True, fastmath=True)
+def _eye_aspect_ratio(lms, eye):
+    """6-point EAR: (|p1-p5| + |p2-p4|) / (2 |p0-p3|)"""
+    horizontal = _distance(lms, eye[0], eye[3])
+    if horizontal <= 0.0:
+        return 0.3  # Default safe value
+    vertical = _distance(lms, eye[1], eye[5]) + _distance(lms, eye[2], eye[4])
+    return vertical / (2.0 * horizontal)
+
+
+@njit(cache=True, fastmath=True)
+def compute_ear_mar(lms):
+    """
+    Eye and mouth aspect ratios from the Face Mesh landmark subset
+    Args:
+        lms: (20, 3) float32 array of the LANDMARK_SUBSET points in pixels
+    Returns:
+        (average EAR of both eyes, MAR of the inner lips)
+    """
+    ear = (_eye_aspect_ratio(lms, _LEFT_EYE)
+           + _eye_aspect_ratio(lms, _RIGHT_EYE)) / 2.0
+
+    m = _MOUTH
+    horizontal = _distance(lms, m[0], m[4])
+    if horizontal <= 0.0:
+        return ear, 0.0
+    vertical = (_distance(lms, m[1], m[7]) + _distance(lms, m[2], m[6])
+                + _distance(lms, m[3], m[5]))
+    return ear, vertical / (2.0 * horizontal)
+
+
+# Compile at import so the first monitored frame doesn't pay for the JIT
+compute_ear_mar(np.zeros((len(LANDMARK_SUBSET), 3), dtype=np.float32))
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def bgr_downscale_gray(src, dst):
+    """
+    Fused BGR->GRAY conversion and 2x2 box downscale in one pass
+    Args:
+        src: (H, W, 3) uint8 BGR frame
+        dst: (H//2, W//2) uint8 output, written in place
+    Uses OpenCV's 14-bit fixed-point luma weights, so the result matches
+    cv2.resize(INTER_AREA) + cv2.cvtColor to within one grey level
+    """
+    h, w = dst.shape
+    for y in prange(h):
+        y0 = 2 * y
+        y1 = y0 + 1
+        for x in range(w):
+            x0 = 2 * x
+            x1 = x0 + 1
+            b = (np.int32(src[y0, x0, 0]) + src[y0, x1, 0]
+                 + src[y1, x0, 0] + src[y1, x1, 0])
+            g = (np.int32(src[y0, x0, 1]) + src[y0, x1, 1]
+                 + src[y1, x0, 1] + src[y1, x1, 1])
+            r = (np.int32(src[y0, x0, 2]) + src[y0, x1, 2]
+                 + src[y1, x0, 2] + src[y1, x1, 2])
+            dst[y, x] = (1868 * b + 9617 * g + 4899 * r + 32768) >> 16
+
+
+# The fused kernel only beats OpenCV's SIMD resize + cvtColor when it can
+# spread rows over several cores; on a single core it is ~1.4x slower
+FUSED_DOWNSCALE = NUMBA_AVAILABLE and numba.get_num_threads() > 1
+if FUSED_DOWNSCALE:
+    bgr_downscale_gray(np.zeros((4, 4, 3), dtype=np.uint8),
+                       np.empty((2, 2), dtype=np.uint8))
+
+
+@lru_cache(maxsize=32)
+def _render_banner(text, scale, color, thickness):
+    """
+    Rasterize a text overlay once
+    Returns:
+        (sprite, mask, dx, dy) - BGR sprite, its uint8 text mask and the
+        offset of its top-left corner from the cv2.putText origin
+    """
+    font = cv2.FONT_HERSHEY_SIMPLEX
+    (text_w, text_h), baseline = cv2.getTextSize(text, font, scale, thickness)
+    pad = thickness
+    sprite = np.zeros((text_h + baseline + 2 * pad, text_w + 2 * pad, 3), dtype=np.uint8)
+    cv2.putText(sprite, text, (pad, pad + text_h), font, scale, color, thickness)
+    mask = sprite.any(axis=2).astype(np.uint8)
+    return sprite, mask, -pad, -(pad + text_h)
+
+
+def _draw_banner(frame, text, origin, scale, color, thickness):
+    """Blit a cached text sprite; same pixels as cv2.putText at origin"""
+    sprite, mask, dx, dy = _render_banner(text, scale, color, thickness)
+    top = origin[1] + dy
+    left = origin[0] + dx
+    bottom = top + sprite.shape[0]
+    right = left + sprite.shape[1]
+    # OpenCV rasterizes strokes clipped by the frame edge differently, so
+    # banners that don't fit entirely are drawn directly
+    if top < 0 or left < 0 or bottom > frame.shape[0] or right > frame.shape[1]:
+        cv2.putText(frame, text, origin, cv2.FONT_HERSHEY_SIMPLEX, scale, color, thickness)
+        return
+    cv2.copyTo(sprite, mask, frame[top:bottom, left:right])
+
 
 class ProductionDetector:
     """
@@ -23,11 +164,76 @@ class ProductionDetector:
     Falls back gracefully when camera is not available
     """
     
-    def __init__(self):
+    # Smallest face (px, in a 640x480 frame) we need to find. The cascade
+    # only needs ~80 px faces, so it runs on the frame scaled by
+    # k = CASCADE_FACE_SIZE / MIN_FACE_SIZE
+    MIN_FACE_SIZE = 160
+    CASCADE_FACE_SIZE = 80
+    CASCADE_SCALE = CASCADE_FACE_SIZE / MIN_FACE_SIZE
+    # Face Mesh works on normalized coordinates, so it gets a reduced frame
+    MESH_INPUT_SIZE = (320, 240)
+    EAR_THRESHOLD = 0.25
+    MAR_THRESHOLD = 0.7
+    # Face Mesh instances used by detect_drowsiness_batch()
+    MESH_POOL_SIZE = 2
+    # Demo probabilities swing over ~63 s and ~94 s at 30 FPS
+    # (the periods of sin(t / 10) and sin(t / 15))
+    SINE_LUT_SIZE = 1024
+    DROWSY_PERIOD_FRAMES = 1885
+    YAWN_PERIOD_FRAMES = 2827
+    RANDOM_BATCH_SIZE = 1024
+    
+    def __init__(self, frame_shape=(480, 640, 3)):
+        """
+        Args:
+            frame_shape: Expected shape of incoming frames; overlay
+                geometry is precomputed for it
+        """
         self.is_demo_mode = True  # Always demo mode in production
         self.face_cascade = None
         self.mp_face_mesh = None
         self.face_mesh = None
+        self.use_opencl = False
+        
+        # Color conversions for the frame being processed, shared by the
+        # cascade and Face Mesh paths; reset at the start of every call
+        self._last_gray = None
+        self._last_rgb = None
+        
+        # Demo-mode signal: sine table indexed by a frame counter and
+        # uniform draws generated a batch at a time
+        self._sin_lut = np.sin(
+            np.linspace(0, 2 * np.pi, self.SINE_LUT_SIZE, endpoint=False)
+        ).tolist()
+        self._frame_ct = 0
+        self._rng = np.random.default_rng()
+        self._uniforms = []
+        
+        # Simulated face rectangle for the expected frame size
+        self._frame_shape = tuple(frame_shape)
+        self._rect_pts = self._face_rect(frame_shape)
+        # Pre-rendered demo overlays keyed by (is_drowsy, is_yawning)
+        self._overlay_cache = {}
+        
+        # Output buffer for the fused cascade downscale
+        self._cascade_buf = None
+        # Face Mesh input scratch (resized, then swapped to RGB in place)
+        self._rgb_scratch = self._new_mesh_buffer()
+        
+        # Reused landmark buffer for the EAR/MAR kernel
+        self._landmarks = np.empty((len(LANDMARK_SUBSET), 3), dtype=np.float32)
+        
+        # Batch mesh pool, its per-instance scratch buffers and executor,
+        # created on first batch call
+        self._meshes = None
+        self._mesh_scratch = None
+        self._batch_executor = None
+        self._batch_lock = threading.Lock()
+        
+        # get_detector() shares one instance per process, and the scratch
+        # buffers, demo state and Face Mesh graphs above are not
+        # thread-safe, so detection calls run one at a time
+        self._detect_lock = threading.Lock()
         
         self._initialize_detectors()
     
@@ -42,68 +248,170 @@ class ProductionDetector:
         except Exception as e:
             logger.warning(f"⚠️ OpenCV cascade failed: {e}")
         
+        # Run the cascade through the transparent API when a device exists
+        try:
+            if cv2.ocl.haveOpenCL():
+                cv2.ocl.setUseOpenCL(True)
+                self.use_opencl = cv2.ocl.useOpenCL()
+        except Exception as e:
+            logger.warning(f"⚠️ OpenCL unavailable: {e}")
+        if self.use_opencl:
+            logger.info("✅ OpenCL enabled for cascade detection")
+        
         # Try to initialize MediaPipe if available
         if MEDIAPIPE_AVAILABLE:
             try:
                 self.mp_face_mesh = mp.solutions.face_mesh
-                self.face_mesh = self.mp_face_mesh.FaceMesh(
-                    static_image_mode=False,
-                    max_num_faces=1,
-                    refine_landmarks=True,
-                    min_detection_confidence=0.7,
-                    min_tracking_confidence=0.7
-                )
+                self.face_mesh = self._create_face_mesh()
                 logger.info("✅ MediaPipe Face Mesh initialized")
             except Exception as e:
                 logger.warning(f"⚠️ MediaPipe initialization failed: {e}")
     
-    def detect_drowsiness(self, frame):
+    def _create_face_mesh(self):
+        """Create a Face Mesh instance with the production settings"""
+        return self.mp_face_mesh.FaceMesh(
+            static_image_mode=False,
+            max_num_faces=1,
+            # Iris refinement roughly doubles the model cost and
+            # the EAR/MAR math never looks at iris points
+            refine_landmarks=False,
+            min_detection_confidence=0.5,
+            min_tracking_confidence=0.5
+        )
+    
+    @property
+    def uses_gray(self):
+        """True when detect_drowsiness() consumes precomputed gray/small frames"""
+        return (not self.is_demo_mode and self.face_mesh is None
+                and self.face_cascade is not None)
+    
+    def detect_drowsiness(self, frame, gray=None, small=None):
         """
         Main detection function - returns demo results in production
         Args:
             frame: Video frame (BGR format)
+            gray: Optional precomputed grayscale of frame
+            small: Optional half-size grayscale (cv2.pyrDown of gray)
         Returns:
             (is_drowsy, is_yawning, annotated_frame)
+        annotated_frame is `frame` itself, drawn on in place; callers that
+        need the original must copy it first, and callers that reuse the
+        input buffer must consume the result before the next read
         """
+        with self._detect_lock:
+            return self._detect_frame(frame, gray, small)
+    
+    def _detect_frame(self, frame, gray=None, small=None):
+        """detect_drowsiness() body; caller holds _detect_lock"""
         if frame is None:
             return False, False, self._create_demo_frame()
         
+        # Callers may reuse one buffer for every frame, so cached
+        # conversions are only valid within a single call
+        self._last_gray = None
+        self._last_rgb = None
+        
         try:
             # In production, we simulate detection results
             if self.is_demo_mode:
                 return self._demo_detection(frame)
             else:
                 # Real detection (would work with camera)
-                return self._real_detection(frame)
+                return self._real_detection(frame, gray, small)
                 
         except Exception as e:
             logger.error(f"Detection error: {e}")
             return False, False, self._create_error_frame(str(e))
     
+    def detect_drowsiness_batch(self, frames):
+        """
+        Run detection over several frames at once
+        MediaPipe has no batched API, so the batch is split across a small
+        pool of Face Mesh instances running in parallel threads; each
+        instance sees its frames in order
+        Args:
+            frames: List of video frames (BGR format)
+        Returns:
+            List of (is_drowsy, is_yawning, annotated_frame), one per frame
+        """
+        with self._detect_lock:
+            if self.is_demo_mode or self.face_mesh is None or len(frames) < 2:
+                return [self._detect_frame(frame) for frame in frames]
+            return self._detect_pooled(frames)
+    
+    def _detect_pooled(self, frames):
+        """Spread a batch over the Face Mesh pool; caller holds _detect_lock"""
+        meshes, scratch, executor = self._get_mesh_pool()
+        futures = [
+            executor.submit(self._detect_chunk, mesh, scratch[i], frames[i::len(meshes)])
+            for i, mesh in enumerate(meshes)
+        ]
+        chunks = [future.result() for future in futures]
+        
+        # Interleave the per-mesh results back into frame order
+        results = [None] * len(frames)
+        for i, chunk in enumerate(chunks):
+            results[i::len(meshes)] = chunk
+        return results
+    
+    def _get_mesh_pool(self):
+        """Create the batch Face Mesh pool and its executor on first use"""
+        with self._batch_lock:
+            if self._meshes is None:
+                self._meshes = [
+                    self._create_face_mesh() for _ in range(self.MESH_POOL_SIZE)
+                ]
+                # Chunks run concurrently, so each instance gets its own
+                # (landmarks, rgb) buffers, allocated once and reused
+                self._mesh_scratch = [
+                    (np.empty_like(self._landmarks), self._new_mesh_buffer())
+                    for _ in range(self.MESH_POOL_SIZE)
+                ]
+                self._batch_executor = ThreadPoolExecutor(
+                    max_workers=self.MESH_POOL_SIZE,
+                    thread_name_prefix="drowsisense-mesh"
+                )
+                logger.info(f"✅ Face Mesh batch pool ready ({self.MESH_POOL_SIZE} instances)")
+        return self._meshes, self._mesh_scratch, self._batch_executor
+    
+    def _detect_chunk(self, face_mesh, scratch, frames):
+        """Run one Face Mesh instance over its share of a batch"""
+        landmarks, rgb = scratch
+        results = []
+        for frame in frames:
+            try:
+                mesh_results = face_mesh.process(self._mesh_input(frame, rgb))
+                results.append(self._mesh_result(frame, mesh_results, landmarks))
+            except Exception as e:
+                logger.error(f"Detection error: {e}")
+                results.append((False, False, self._create_error_frame(str(e))))
+        return results
+    
     def _demo_detection(self, frame):
         """
         Demo detection for production environment
         Simulates real detection with random results
         """
-        import random
-        import time
-        
-        # Simulate detection with realistic patterns
-        current_time = time.time()
+        self._frame_ct += 1
+        ct = self._frame_ct
+        lut = self._sin_lut
+        n = self.SINE_LUT_SIZE
         
         # Create realistic detection patterns
-        drowsy_probability = 0.1 + 0.05 * np.sin(current_time / 10)  # Varies over time
-        yawn_probability = 0.08 + 0.03 * np.sin(current_time / 15)
+        drowsy_probability = 0.1 + 0.05 * lut[ct * n // self.DROWSY_PERIOD_FRAMES % n]  # Varies over time
+        yawn_probability = 0.08 + 0.03 * lut[ct * n // self.YAWN_PERIOD_FRAMES % n]
         
-        is_drowsy = random.random() < drowsy_probability
-        is_yawning = random.random() < yawn_probability
+        if len(self._uniforms) < 2:
+            self._uniforms = self._rng.random(self.RANDOM_BATCH_SIZE).tolist()
+        is_drowsy = self._uniforms.pop() < drowsy_probability
+        is_yawning = self._uniforms.pop() < yawn_probability
         
         # Annotate frame with demo information
         annotated_frame = self._annotate_demo_frame(frame, is_drowsy, is_yawning)
         
         return is_drowsy, is_yawning, annotated_frame
     
-    def _real_detection(self, frame):
+    def _real_detection(self, frame, gray=None, small=None):
         """
         Real detection using available ML models
         """
@@ -111,7 +419,7 @@ class ProductionDetector:
             if self.face_mesh is not None:
                 return self._mediapipe_detection(frame)
             elif self.face_cascade is not None:
-                return self._opencv_detection(frame)
+                return self._opencv_detection(frame, gray, small)
             else:
                 return self._demo_detection(frame)
         except Exception as e:
@@ -122,26 +430,35 @@ class ProductionDetector:
         """Detection using MediaPipe"""
         # Implement MediaPipe detection logic
         # This would be the actual detection code
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self.face_mesh.process(rgb_frame)
-        
-        # Simplified detection logic
+        results = self.face_mesh.process(self._rgb_frame(frame))
+        return self._mesh_result(frame, results, self._landmarks)
+    
+    def _mesh_result(self, frame, results, landmarks):
+        """Turn a Face Mesh result into (is_drowsy, is_yawning, annotated)"""
         is_drowsy = False
         is_yawning = False
         
         if results.multi_face_landmarks:
-            # Basic detection based on face landmarks
-            # In a real implementation, this would calculate EAR, MAR, etc.
-            is_drowsy = np.random.random() < 0.1
-            is_yawning = np.random.random() < 0.1
+            lms = self._landmark_array(
+                results.multi_face_landmarks[0].landmark, frame.shape, landmarks
+            )
+            ear, mar = compute_ear_mar(lms)
+            is_drowsy = ear < self.EAR_THRESHOLD
+            is_yawning = mar > self.MAR_THRESHOLD
         
         annotated_frame = self._annotate_frame(frame, is_drowsy, is_yawning, "MediaPipe")
         return is_drowsy, is_yawning, annotated_frame
     
-    def _opencv_detection(self, frame):
+    def _opencv_detection(self, frame, gray=None, small=None):
         """Detection using OpenCV cascades"""
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        faces = self.face_cascade.detectMultiScale(gray, 1.3, 5)
+        if small is None:
+            small = self._cascade_gray(frame, gray)
+        if self.use_opencl:
+            small = cv2.UMat(small)
+        # Reduced frame - only the face count is used below
+        faces = self.face_cascade.detectMultiScale(small, 1.3, 5)
+        if isinstance(faces, cv2.UMat):
+            faces = faces.get()
         
         # Basic detection
         is_drowsy = len(faces) == 0 or np.random.random() < 0.1
@@ -150,39 +467,116 @@ class ProductionDetector:
         annotated_frame = self._annotate_frame(frame, is_drowsy, is_yawning, "OpenCV")
         return is_drowsy, is_yawning, annotated_frame
     
+    def _cascade_gray(self, frame, gray=None):
+        """Grayscale frame at cascade scale, resized before converting"""
+        if self._last_gray is None:
+            k = self.CASCADE_SCALE
+            if gray is not None:
+                self._last_gray = cv2.resize(gray, None, fx=k, fy=k,
+                                             interpolation=cv2.INTER_AREA)
+            elif FUSED_DOWNSCALE and k == 0.5:
+                shape = (frame.shape[0] // 2, frame.shape[1] // 2)
+                if self._cascade_buf is None or self._cascade_buf.shape != shape:
+                    self._cascade_buf = np.empty(shape, dtype=np.uint8)
+                bgr_downscale_gray(frame, self._cascade_buf)
+                self._last_gray = self._cascade_buf
+            else:
+                reduced = cv2.resize(frame, None, fx=k, fy=k,
+                                     interpolation=cv2.INTER_AREA)
+                self._last_gray = cv2.cvtColor(reduced, cv2.COLOR_BGR2GRAY)
+        return self._last_gray
+    
+    def _rgb_frame(self, frame):
+        """RGB frame at Face Mesh input size, resized before converting"""
+        if self._last_rgb is None:
+            self._last_rgb = self._mesh_input(frame, self._rgb_scratch)
+        return self._last_rgb
+    
+    def _new_mesh_buffer(self):
+        """Allocate a uint8 image buffer at the Face Mesh input size"""
+        w, h = self.MESH_INPUT_SIZE
+        return np.empty((h, w, 3), dtype=np.uint8)
+    
+    def _mesh_input(self, frame, out):
+        """
+        Resize to the Face Mesh input size, then convert BGR to RGB, both
+        into `out` without allocating
+        A reversed-channel view (frame[:, :, ::-1]) would avoid the swap,
+        but Face Mesh needs a C-contiguous image
+        """
+        cv2.resize(frame, self.MESH_INPUT_SIZE, dst=out,
+                   interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(out, cv2.COLOR_BGR2RGB, dst=out)
+    
+    def _landmark_array(self, landmarks, shape, out):
+        """Copy the LANDMARK_SUBSET points into `out`, in pixels"""
+        points = (landmarks[i] for i in _LANDMARK_SUBSET_LIST)
+        out[:] = np.fromiter(
+            ((p.x, p.y, p.z) for p in points),
+            dtype=np.dtype((np.float32, 3)), count=len(LANDMARK_SUBSET)
+        )
+        # Normalized x/y are relative to width/height; scale to pixels so
+        # distances are isotropic
+        h, w = shape[:2]
+        out[:, 0] *= w
+        out[:, 1] *= h
+        return out
+    
     def _annotate_demo_frame(self, frame, is_drowsy, is_yawning):
-        """Add demo annotations to frame"""
-        # Create a copy to avoid modifying original
-        annotated = frame.copy()
+        """Add demo annotations to frame (drawn in place)"""
+        # Callers hand over the frame, so skip the per-frame copy
+        if frame.shape != self._frame_shape:
+            # New camera resolution: rebuild the geometry and drop overlays
+            # rendered for the old one
+            self._frame_shape = frame.shape
+            self._rect_pts = self._face_rect(frame.shape)
+            self._overlay_cache.clear()
         
+        # At a given size the overlay depends only on the two flags, so
+        # each combination is rendered once and then blitted
+        key = (is_drowsy, is_yawning)
+        cached = self._overlay_cache.get(key)
+        if cached is None:
+            overlay = np.zeros(self._frame_shape, dtype=np.uint8)
+            self._draw_demo_overlay(overlay, is_drowsy, is_yawning, self._rect_pts)
+            cached = (overlay, overlay.any(axis=2).astype(np.uint8))
+            self._overlay_cache[key] = cached
+        cv2.copyTo(cached[0], cached[1], frame)
+        return frame
+    
+    def _draw_demo_overlay(self, annotated, is_drowsy, is_yawning, rect):
+        """Draw the demo watermark, status banners and face box"""
         # Add demo watermark
-        cv2.putText(annotated, "DEMO MODE - Production Environment", 
-                   (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+        _draw_banner(annotated, "DEMO MODE - Production Environment", 
+                     (10, 30), 0.6, (0, 255, 255), 2)
         
         # Add detection status
         if is_drowsy:
-            cv2.putText(annotated, "DROWSINESS DETECTED!", 
-                       (10, 70), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
+            _draw_banner(annotated, "DROWSINESS DETECTED!", 
+                         (10, 70), 0.8, (0, 0, 255), 2)
         
         if is_yawning:
-            cv2.putText(annotated, "YAWNING DETECTED!", 
-                       (10, 110), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 165, 255), 2)
+            _draw_banner(annotated, "YAWNING DETECTED!", 
+                         (10, 110), 0.8, (0, 165, 255), 2)
         
         # Add simulated face rectangle
-        h, w = annotated.shape[:2]
-        cv2.rectangle(annotated, 
-                     (w//4, h//4), (3*w//4, 3*h//4), 
-                     (0, 255, 0), 2)
+        cv2.rectangle(annotated, rect[0], rect[1], (0, 255, 0), 2)
         
         return annotated
     
+    @staticmethod
+    def _face_rect(shape):
+        """Corners of the simulated face box - the middle half of the frame"""
+        h, w = shape[:2]
+        return (w // 4, h // 4), (3 * w // 4, 3 * h // 4)
+    
     def _annotate_frame(self, frame, is_drowsy, is_yawning, detector_type):
-        """Add detection annotations to frame"""
-        annotated = frame.copy()
+        """Add detection annotations to frame (drawn in place)"""
+        annotated = frame
         
         # Add detector info
-        cv2.putText(annotated, f"Detector: {detector_type}", 
-                   (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+        _draw_banner(annotated, f"Detector: {detector_type}", 
+                     (10, 30), 0.6, (255, 255, 255), 1)
         
         # Add status
         status_text = "ALERT"
@@ -195,8 +589,7 @@ class ProductionDetector:
             status_text = "YAWNING DETECTED!"
             color = (0, 165, 255)  # Orange
         
-        cv2.putText(annotated, status_text, (10, 70), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.8, color, 2)
+        _draw_banner(annotated, status_text, (10, 70), 0.8, color, 2)
         
         return annotated
     
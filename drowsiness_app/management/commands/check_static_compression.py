@@ -0,0 +1,24 @@
+"""
+Management command to verify collectstatic emitted pre-compressed assets
+"""
+from pathlib import Path
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Fail if collectstatic produced no Brotli (.br) static files'
+
+    def handle(self, *args, **options):
+        static_root = Path(settings.STATIC_ROOT)
+        br_count = sum(1 for _ in static_root.rglob('*.br'))
+
+        if not br_count:
+            raise CommandError(
+                f'No .br files found in {static_root}. '
+                'Install the brotli package so WhiteNoise can pre-compress assets.'
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Found {br_count} Brotli-compressed static files')
+        )
@@ -0,0 +1,35 @@
+"""
+Management command to pre-render the spoken drowsiness alert
+"""
+import shutil
+import subprocess
+from pathlib import Path
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Render the spoken drowsiness alert to static/tts_drowsy.wav with espeak'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--text',
+            default='Alert: Drowsiness detected!',
+            help='Phrase to speak when an alert fires',
+        )
+
+    def handle(self, *args, **options):
+        espeak = shutil.which('espeak') or shutil.which('espeak-ng')
+        if espeak is None:
+            raise CommandError('espeak is not installed')
+
+        output_path = Path(settings.BASE_DIR) / 'static' / 'tts_drowsy.wav'
+        try:
+            subprocess.run(
+                [espeak, '-w', str(output_path), options['text']],
+                check=True,
+            )
+        except subprocess.CalledProcessError as e:
+            raise CommandError(f'espeak failed: {e}')
+
+        self.stdout.write(self.style.SUCCESS(f'Rendered spoken alert to {output_path}'))
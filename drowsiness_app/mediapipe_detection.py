@@ -2,6 +2,8 @@
 Alternative drowsiness detection using MediaPipe for better Windows compatibility
 Replaces dlib with MediaPipe Face Mesh for facial landmark detection
 """
+import threading
+
 import cv2
 import numpy as np
 import mediapipe as mp
@@ -9,13 +11,16 @@ from scipy.spatial import distance as dist
 
 
 class MediaPipeDrowsinessDetector:
+    # Face Mesh works on RGB; precomputed gray/small frames go unused
+    uses_gray = False
+    
     def __init__(self):
         # Initialize MediaPipe Face Mesh
         self.mp_face_mesh = mp.solutions.face_mesh
         self.face_mesh = self.mp_face_mesh.FaceMesh(
             static_image_mode=False,
             max_num_faces=1,
-            refine_landmarks=True,
+            refine_landmarks=False,  # Iris points are not used
             min_detection_confidence=0.7,
             min_tracking_confidence=0.7
         )
@@ -36,6 +41,10 @@ class MediaPipeDrowsinessDetector:
         self.ear_counter = 0
         self.mouth_counter = 0
         
+        # One instance is shared per process (get_detector()); Face Mesh
+        # and the counters above must only be used by one thread at a time
+        self._detect_lock = threading.Lock()
+        
     def eye_aspect_ratio(self, eye_landmarks):
         """Calculate eye aspect ratio"""
         if len(eye_landmarks) < 6:
@@ -105,13 +114,20 @@ class MediaPipeDrowsinessDetector:
             
         return left_eye, right_eye, mouth
     
-    def detect_drowsiness(self, frame):
+    def detect_drowsiness(self, frame, gray=None, small=None):
         """
         Main drowsiness detection function
+        gray/small are accepted for interface compatibility; Face Mesh
+        works on RGB, so no grayscale conversion is done here
         Returns: (is_drowsy, is_yawning, frame_with_annotations)
+        Annotations are drawn on `frame` itself; callers that reuse the
+        input buffer must consume the result before the next read
         """
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        
+        with self._detect_lock:
+            return self._detect_frame(frame)
+    
+    def _detect_frame(self, frame):
+        """detect_drowsiness() body; caller holds _detect_lock"""
         # Get facial landmarks
         left_eye, right_eye, mouth = self.get_landmarks(frame)
         
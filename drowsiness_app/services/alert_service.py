@@ -1,12 +1,19 @@
 """
 Alert Service - Handles all alert-related business logic
 """
+import asyncio
 import logging
 from typing import Dict, Any, List, Optional
+from django.conf import settings
 from django.core.mail import EmailMessage
 from django.template.loader import render_to_string
 from django.utils import timezone
 from asgiref.sync import sync_to_async
+try:
+    import aiosmtplib
+    AIOSMTPLIB_AVAILABLE = True
+except ImportError:
+    AIOSMTPLIB_AVAILABLE = False
 
 from ..models import Alert, DriverProfile
 from ..core.exceptions import DrowsinessDetectionError
@@ -14,12 +21,19 @@ from ..core.exceptions import DrowsinessDetectionError
 
 logger = logging.getLogger(__name__)
 
+SMTP_EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+
 
 class AlertService:
     """
     Service class to handle alert operations
     """
     
+    def __init__(self):
+        # Persistent SMTP connection, reused across alerts on the same loop
+        self._smtp = None
+        self._smtp_loop = None
+    
     @staticmethod
     async def create_alert(
         driver_profile: DriverProfile,
@@ -54,8 +68,8 @@ class AlertService:
             logger.error(f"Failed to create alert: {e}")
             raise DrowsinessDetectionError(f"Failed to create alert: {e}")
     
-    @staticmethod
     async def send_email_alert(
+        self,
         alert: Alert,
         recipient_email: str,
         template_name: str = "drowsiness_alert.html"
@@ -88,7 +102,10 @@ class AlertService:
             email = EmailMessage(subject, message, to=[recipient_email])
             email.content_subtype = "html"
             
-            await sync_to_async(email.send)()
+            if AIOSMTPLIB_AVAILABLE and settings.EMAIL_BACKEND == SMTP_EMAIL_BACKEND:
+                await self._send_smtp(email)
+            else:
+                await sync_to_async(email.send)()
             logger.info(f"Email alert sent to {recipient_email}")
             return True
             
@@ -96,6 +113,58 @@ class AlertService:
             logger.error(f"Failed to send email alert: {e}")
             return False
     
+    async def _get_smtp(self) -> "aiosmtplib.SMTP":
+        """
+        Get the persistent SMTP connection, connecting on first use
+        Returns: Connected and authenticated aiosmtplib.SMTP client
+        """
+        loop = asyncio.get_running_loop()
+        if self._smtp is not None and self._smtp_loop is loop and self._smtp.is_connected:
+            return self._smtp
+        self._discard_smtp()
+        
+        smtp = aiosmtplib.SMTP(
+            hostname=settings.EMAIL_HOST,
+            port=settings.EMAIL_PORT,
+            use_tls=settings.EMAIL_USE_SSL,
+            start_tls=settings.EMAIL_USE_TLS,
+            timeout=settings.EMAIL_TIMEOUT or 30,
+        )
+        await smtp.connect()
+        if settings.EMAIL_HOST_USER:
+            await smtp.login(settings.EMAIL_HOST_USER, settings.EMAIL_HOST_PASSWORD)
+        
+        self._smtp = smtp
+        self._smtp_loop = loop
+        return smtp
+    
+    def _discard_smtp(self) -> None:
+        """Close and forget the cached SMTP connection, if any"""
+        smtp, self._smtp, self._smtp_loop = self._smtp, None, None
+        if smtp is None:
+            return
+        try:
+            smtp.close()
+        except Exception as e:
+            # The loop it was opened on may already be closed
+            logger.debug(f"Closing stale SMTP connection failed: {e}")
+    
+    async def _send_smtp(self, email: EmailMessage) -> None:
+        """Send over the persistent connection, reconnecting once if it dropped"""
+        for attempt in range(2):
+            smtp = await self._get_smtp()
+            try:
+                await smtp.send_message(
+                    email.message(),
+                    sender=email.from_email,
+                    recipients=email.recipients(),
+                )
+                return
+            except aiosmtplib.SMTPServerDisconnected:
+                self._discard_smtp()
+                if attempt:
+                    raise
+    
     @staticmethod
     async def get_driver_alerts(
         driver_profile: DriverProfile,
@@ -22,6 +22,7 @@ class DetectionService:
         self.detector = None
         self.is_monitoring = False
         self.current_task = None
+        self.engine = None
     
     async def initialize_detector(self) -> bool:
         """
@@ -72,6 +73,10 @@ class DetectionService:
                 self.current_task.cancel()
                 self.current_task = None
             
+            if self.engine:
+                await self.engine.stop_monitoring()
+                self.engine = None
+            
             self.is_monitoring = False
             logger.info("Monitoring stopped successfully")
             return True
@@ -245,7 +245,7 @@ async def drowsiness_detection_task(
             )
 
         cv2.imshow("Frame", frame)
-        key = cv2.waitKey(1) & 0xFF
+        key = cv2.pollKey() & 0xFF
 
         if key == ord("q"):
             break
@@ -2,6 +2,7 @@
 Fixed tasks.py - Resolves async context errors and improves detection
 """
 import os
+import sys
 import cv2
 try:
     import pygame.mixer
@@ -9,23 +10,220 @@ try:
 except ImportError:
     PYGAME_AVAILABLE = False
 import time
+import queue
+import signal
+import smtplib
 import asyncio
-from threading import Thread
+import threading
+from functools import lru_cache
+from threading import Condition, Event, Lock, Thread
 from asgiref.sync import sync_to_async, async_to_sync
-from django.core.mail import EmailMessage
-from django.template.loader import render_to_string
+from django.core.mail import EmailMessage, get_connection
+from django.template.loader import get_template
 from .models import Alert, DriverProfile
 from .detection_factory import get_detector
+from .utils.frame_stream import frame_stream
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
+# Local preview window; off by default so headless servers skip HighGUI
+SHOW_UI = os.environ.get("DROWSI_SHOW_UI") == "1"
+
+WINDOW_NAME = "DrowsiSense - Driver Monitoring"
+FRAME_WIDTH = 640
+FRAME_HEIGHT = 480
+# Native capture API per platform (default backend as fallback)
+if os.name == 'nt':
+    CAPTURE_BACKEND = cv2.CAP_MSMF
+elif sys.platform == 'darwin':
+    CAPTURE_BACKEND = cv2.CAP_AVFOUNDATION
+else:
+    CAPTURE_BACKEND = cv2.CAP_V4L2
+# Processed frames buffered for display; small so display applies back-pressure
+PIPELINE_QUEUE_SIZE = 2
+QUEUE_POLL_SECONDS = 0.1
+# Frames handed to the detector per call; a partial batch is flushed
+# once the first frame has waited BATCH_TIMEOUT_SECONDS
+BATCH_SIZE = 4
+BATCH_TIMEOUT_SECONDS = 0.1
+
+# Alerts waiting for the audio thread; further alerts are dropped
+AUDIO_QUEUE_SIZE = 2
+
+ALERT_EMAIL_TEMPLATE = "drowsiness_alert.html"
+ALERT_EMAIL_SUBJECTS = {
+    "drowsiness": "🚨 Drowsiness Alert - Immediate Attention Required",
+}
+DEFAULT_ALERT_EMAIL_SUBJECT = "⚠️ Fatigue Alert - Driver Monitoring System"
+
+# Mail connection kept open across alerts; guarded because alert emails
+# are sent from concurrent daemon threads
+_MAIL_LOCK = Lock()
+_mail_connection = None
+
+
+def _put(q, item, stop):
+    """Blocking put that gives up once the pipeline is stopping"""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=QUEUE_POLL_SECONDS)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _get(q, stop):
+    """Blocking get that returns None once the pipeline is stopping"""
+    while not stop.is_set():
+        try:
+            return q.get(timeout=QUEUE_POLL_SECONDS)
+        except queue.Empty:
+            continue
+    return None
+
+
+class LatestFrame:
+    """
+    Single-slot frame buffer between the reader and detection
+    The reader overwrites any frame detection hasn't taken yet, so when
+    detection lags it always works on the newest frame instead of a
+    backlog of stale ones
+    """
+
+    def __init__(self):
+        self._cond = Condition()
+        self._frame = None
+        self._seq = 0
+        self._taken = 0
+        self.ended = False
+
+    def put(self, frame):
+        """Publish a new frame, replacing any untaken one"""
+        with self._cond:
+            self._frame = frame
+            self._seq += 1
+            self._cond.notify()
+
+    def end(self):
+        """Mark the stream as finished"""
+        with self._cond:
+            self.ended = True
+            self._cond.notify()
+
+    def take(self, timeout):
+        """
+        Take the newest frame not handed out yet
+        Returns:
+            The frame, or None if nothing new arrived within timeout
+        """
+        with self._cond:
+            if not self._cond.wait_for(
+                lambda: self._seq != self._taken or self.ended, timeout
+            ):
+                return None
+            if self._seq == self._taken:
+                return None
+            self._taken = self._seq
+            frame, self._frame = self._frame, None
+            return frame
+
+
+def _get_batch(slot, stop):
+    """
+    Collect up to BATCH_SIZE fresh frames from the capture slot
+    Returns:
+        (frames, ended) - ended is True once the stream or pipeline stopped
+    """
+    frame = None
+    while frame is None:
+        if stop.is_set() or slot.ended:
+            return [], True
+        frame = slot.take(QUEUE_POLL_SECONDS)
+
+    frames = [frame]
+    deadline = time.monotonic() + BATCH_TIMEOUT_SECONDS
+    while len(frames) < BATCH_SIZE:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        frame = slot.take(remaining)
+        if frame is None:
+            break
+        frames.append(frame)
+    return frames, slot.ended
+
+
+def open_capture(webcam_index):
+    """
+    Open a camera for low-latency capture
+    Uses the platform's native backend, asks for 640x480 MJPG and keeps a
+    one-frame driver buffer so a slow consumer sees fresh frames
+    Raises:
+        Exception: If the camera cannot be opened
+    """
+    cap = cv2.VideoCapture(webcam_index, CAPTURE_BACKEND)
+    if not cap.isOpened():
+        cap = cv2.VideoCapture(webcam_index)
+    if not cap.isOpened():
+        raise Exception(f"Cannot open camera {webcam_index}")
+
+    # MJPG lets USB cameras deliver 640x480 at 30 FPS instead of a slower
+    # raw mode
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, FRAME_WIDTH)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, FRAME_HEIGHT)
+    # Keep the driver queue short so frames are dropped, not delayed
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    return cap
+
+
+def _read_frames(cap, slot, stop):
+    """Reader stage: decode camera frames into the single-slot buffer"""
+    needs_resize = None
+    while not stop.is_set():
+        ret, frame = cap.read()
+        if not ret or frame is None:
+            print("⚠️ No video frame received.")
+            break
+
+        # Resize only if the camera ignored the requested size
+        if needs_resize is None:
+            needs_resize = frame.shape[:2] != (FRAME_HEIGHT, FRAME_WIDTH)
+        if needs_resize:
+            frame = cv2.resize(frame, (FRAME_WIDTH, FRAME_HEIGHT))
+        slot.put(frame)
+    # End of stream
+    slot.end()
+
+
+def _display_frames(write_q, stop):
+    """Display stage: show processed frames and watch for the quit key"""
+    try:
+        while not stop.is_set():
+            frame = _get(write_q, stop)
+            if frame is None:
+                break
+            cv2.imshow(WINDOW_NAME, frame)
+
+            # Pump GUI events and check for the quit key without waitKey's sleep
+            key = cv2.pollKey() & 0xFF
+            if key == ord("q"):
+                print("👋 User requested quit")
+                stop.set()
+    finally:
+        cv2.destroyAllWindows()
+
 
 def drowsiness_detection_task_sync(
-    webcam_index, ear_thresh, ear_frames, yawn_thresh, driver_profile, driver_email
+    webcam_index, ear_thresh, ear_frames, yawn_thresh, driver_profile, driver_email,
+    stop_event=None
 ):
     """
     SYNCHRONOUS drowsiness detection task - FIXED VERSION
     This runs in a separate thread to avoid async context issues
+    Set stop_event to end the task; SIGTERM and the preview window's
+    "q" key (DROWSI_SHOW_UI=1) also stop it
     """
     print("✅ Drowsiness detection task started (SYNC VERSION).")
     
@@ -57,38 +255,67 @@ def drowsiness_detection_task_sync(
 
     print("-> Starting Video Stream")
     try:
-        cap = cv2.VideoCapture(webcam_index)
-        if not cap.isOpened():
-            raise Exception(f"Cannot open camera {webcam_index}")
-        
-        # Set camera properties
-        cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+        cap = open_capture(webcam_index)
         print("✅ Video stream opened successfully.")
     except Exception as e:
         print(f"❌ Error opening video stream: {e}")
         return
 
+    # One thread plays every alert so speech never blocks detection
+    audio_q = queue.Queue(maxsize=AUDIO_QUEUE_SIZE)
+    audio_thread = Thread(target=_audio_worker, args=(audio_q,), daemon=True)
+    audio_thread.start()
+
+    # Annotated frames are served to /video-feed/ while this task runs
+    frame_stream.start(driver_profile.user_id)
+
     # Detection state variables
     drowsy_counter = 0
     yawn_counter = 0
     last_alert_time = 0
     alert_cooldown = 5  # seconds
 
+    # Detectors that can spread a batch over several models take frames
+    # in groups; others get them one at a time
+    detect_batch = getattr(detector, 'detect_drowsiness_batch', None)
+    if detect_batch is None:
+        def detect_batch(frames):
+            return [detector.detect_drowsiness(frame) for frame in frames]
+
+    # Reader decodes the next frame and the display thread shows the last
+    # one while detection runs here; frames arriving faster than detection
+    # are dropped in the slot
+    stop = stop_event if stop_event is not None else Event()
+    slot = LatestFrame()
+    reader = Thread(target=_read_frames, args=(cap, slot, stop), daemon=True)
+    reader.start()
+    write_q = None
+    writer = None
+    if SHOW_UI:
+        write_q = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        writer = Thread(target=_display_frames, args=(write_q, stop), daemon=True)
+        writer.start()
+
+    # Signal handlers can only be installed from the main thread
+    handle_sigterm = threading.current_thread() is threading.main_thread()
+    if handle_sigterm:
+        previous_sigterm = signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+
     try:
-        while True:
-            ret, frame = cap.read()
-            if not ret or frame is None:
-                print("⚠️ No video frame received.")
+        while not stop.is_set():
+            frames, ended = _get_batch(slot, stop)
+            if not frames:
                 break
 
-            # Resize frame for better performance
-            frame = cv2.resize(frame, (640, 480))
-
             try:
                 # Use the detection system
-                is_drowsy, is_yawning, annotated_frame = detector.detect_drowsiness(frame)
+                results = detect_batch(frames)
+            except Exception as e:
+                print(f"⚠️ Error in detection loop: {e}")
+                # Continue with basic frame display
+                results = [(False, False, frame) for frame in frames]
 
+            for is_drowsy, is_yawning, annotated_frame in results:
                 current_time = time.time()
                 alert_triggered = False
 
@@ -104,7 +331,7 @@ def drowsiness_detection_task_sync(
                                 "Drowsiness detected!",
                                 driver_email
                             )
-                            play_alert_sync("Drowsiness Alert!")
+                            play_alert_sync("Drowsiness Alert!", audio_q)
                             last_alert_time = current_time
                             print("🚨 Drowsiness alert triggered!")
                         drowsy_counter = 0  # Reset after alert
@@ -123,40 +350,46 @@ def drowsiness_detection_task_sync(
                                 "Excessive yawning detected!",
                                 driver_email
                             )
-                            play_alert_sync("Yawn Alert!")
+                            play_alert_sync("Yawn Alert!", audio_q)
                             last_alert_time = current_time
                             print("🚨 Yawn alert triggered!")
                         yawn_counter = 0  # Reset after alert
                 else:
                     yawn_counter = 0
 
-                # Display the annotated frame
-                cv2.imshow("DrowsiSense - Driver Monitoring", annotated_frame)
-
-                # Check for quit key
-                key = cv2.waitKey(1) & 0xFF
-                if key == ord("q"):
-                    print("👋 User requested quit")
-                    break
+                # Hand off to the display thread; frame pacing comes from
+                # cap.read(). Headless runs drop the frame here
+                if write_q is not None:
+                    _put(write_q, annotated_frame, stop)
 
-                # Control frame rate (~30 FPS)
-                time.sleep(0.033)
+            # MJPEG clients only need the newest frame of the batch
+            frame_stream.publish_frame(results[-1][2])
 
-            except Exception as e:
-                print(f"⚠️ Error in detection loop: {e}")
-                # Continue with basic frame display
-                cv2.imshow("DrowsiSense - Driver Monitoring", frame)
-                key = cv2.waitKey(1) & 0xFF
-                if key == ord("q"):
-                    break
+            if ended:
+                break
 
     except KeyboardInterrupt:
         print("👋 Detection stopped by user")
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
     finally:
+        stop.set()
+        frame_stream.stop()
+        reader.join()
+        if writer is not None:
+            writer.join()
+        if handle_sigterm:
+            signal.signal(signal.SIGTERM, previous_sigterm)
         cap.release()
-        cv2.destroyAllWindows()
+        # Drop alerts that haven't played yet so the sentinel always fits
+        # (this thread is the only producer), then wait for the audio thread
+        while True:
+            try:
+                audio_q.get_nowait()
+            except queue.Empty:
+                break
+        audio_q.put(None)
+        audio_thread.join()
         print("✅ Drowsiness detection task completed.")
 
 
@@ -201,13 +434,16 @@ def create_alert_sync(driver_profile, alert_type, description, driver_email):
         print(f"❌ Failed to create alert: {e}")
 
 
+@lru_cache(maxsize=1)
+def _alert_email_template():
+    """Load and compile the alert email template once per process"""
+    return get_template(ALERT_EMAIL_TEMPLATE)
+
+
 def send_email_alert_sync(alert, driver_profile, driver_email):
     """Send email alert synchronously"""
     try:
-        if alert.alert_type == "drowsiness":
-            subject = "🚨 Drowsiness Alert - Immediate Attention Required"
-        else:
-            subject = "⚠️ Fatigue Alert - Driver Monitoring System"
+        subject = ALERT_EMAIL_SUBJECTS.get(alert.alert_type, DEFAULT_ALERT_EMAIL_SUBJECT)
             
         context = {
             "driver": driver_profile,
@@ -215,53 +451,99 @@ def send_email_alert_sync(alert, driver_profile, driver_email):
             "driver_first_name": driver_profile.user.first_name or "Driver",
         }
         
-        message = render_to_string("drowsiness_alert.html", context)
+        message = _alert_email_template().render(context)
         email = EmailMessage(subject, message, to=[driver_email])
         email.content_subtype = "html"
         
-        email.send()
+        _send_on_shared_connection(email)
         print(f"📧 Email alert sent to {driver_email}")
         
     except Exception as e:
         print(f"❌ Failed to send email alert: {e}")
 
 
-def play_alert_sync(message):
-    """Play audio alert synchronously"""
+def _send_on_shared_connection(email):
+    """
+    Send over the process-wide mail connection, opening it on first use
+    The TLS handshake is paid once; a dropped connection is reopened and
+    the send retried once
+    """
+    global _mail_connection
+    with _MAIL_LOCK:
+        if _mail_connection is None:
+            _mail_connection = get_connection()
+            _mail_connection.open()
+        email.connection = _mail_connection
+        try:
+            return email.send()
+        except (smtplib.SMTPException, OSError):
+            _mail_connection.close()
+            _mail_connection.open()
+            return email.send()
+
+
+def _init_tts():
+    """Create the Windows TTS engine, or None where espeak is used instead"""
+    if os.name != 'nt':
+        return None
     try:
-        # Play audio file
-        if PYGAME_AVAILABLE:
-            pygame.mixer.music.play()
-            print("🔊 Audio alert played")
-        else:
-            print("⚠️ Audio alert skipped - pygame not available")
+        import pyttsx3
+        engine = pyttsx3.init()
+        engine.setProperty('rate', 200)  # Speed
+        engine.setProperty('volume', 0.9)  # Volume
+        print("✅ TTS engine initialized")
+        return engine
+    except ImportError:
+        print("⚠️ pyttsx3 not available, skipping TTS")
     except Exception as e:
-        print(f"⚠️ Audio playback failed: {e}")
-    
-    try:
-        # Windows TTS using pyttsx3 (better than espeak on Windows)
-        if os.name == 'nt':  # Windows
-            try:
-                import pyttsx3
-                engine = pyttsx3.init()
-                engine.setProperty('rate', 200)  # Speed
-                engine.setProperty('volume', 0.9)  # Volume
-                engine.say(message)
-                engine.runAndWait()
+        print(f"⚠️ TTS initialization failed: {e}")
+    return None
+
+
+def _audio_worker(audio_q):
+    """Play queued alerts one at a time until a None sentinel arrives"""
+    # Build the TTS engine once, on the thread that uses it;
+    # pyttsx3.init() is far too slow per alert
+    tts_engine = _init_tts()
+    while True:
+        message = audio_q.get()
+        if message is None:
+            break
+
+        try:
+            # Play audio file
+            if PYGAME_AVAILABLE:
+                pygame.mixer.music.play()
+                print("🔊 Audio alert played")
+            else:
+                print("⚠️ Audio alert skipped - pygame not available")
+        except Exception as e:
+            print(f"⚠️ Audio playback failed: {e}")
+
+        try:
+            # Windows TTS using pyttsx3 (better than espeak on Windows)
+            if tts_engine is not None:
+                tts_engine.say(message)
+                tts_engine.runAndWait()
                 print("🗣️ TTS alert played")
-            except ImportError:
-                print("⚠️ pyttsx3 not available, skipping TTS")
-            except Exception as e:
-                print(f"⚠️ TTS failed: {e}")
-        else:
-            # Linux/Mac - use espeak if available
-            try:
+            elif os.name != 'nt':
+                # Linux/Mac - use espeak if available
                 os.system(f'espeak "{message}"')
-            except Exception as e:
-                print(f"⚠️ espeak failed: {e}")
-                
-    except Exception as e:
-        print(f"⚠️ TTS system failed: {e}")
+        except Exception as e:
+            print(f"⚠️ TTS failed: {e}")
+
+
+def play_alert_sync(message, audio_q):
+    """
+    Queue an audio alert and return immediately
+    Args:
+        message: Text to speak after the alarm sound
+        audio_q: Queue consumed by _audio_worker
+    """
+    try:
+        audio_q.put_nowait(message)
+    except queue.Full:
+        print("⚠️ Audio alert dropped - previous alerts still playing")
 
 
 # Keep the async version for compatibility but redirect to sync version
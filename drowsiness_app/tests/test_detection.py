@@ -0,0 +1,158 @@
+"""
+Unit tests for the production detector helpers
+"""
+import importlib.util
+import sys
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+from django.test import SimpleTestCase
+
+from .. import detection_production
+from ..detection_production import (
+    LEFT_EYE_INDICES, RIGHT_EYE_INDICES, MOUTH_INDICES, LANDMARK_SUBSET,
+    ProductionDetector, _draw_banner,
+)
+
+
+def _load_without_numba():
+    """Load a private copy of detection_production with numba unavailable"""
+    spec = importlib.util.spec_from_file_location(
+        "detection_production_nonumba", detection_production.__file__
+    )
+    module = importlib.util.module_from_spec(spec)
+    with patch.dict(sys.modules, {"numba": None}):
+        spec.loader.exec_module(module)
+    return module
+
+
+def _reference_ear_mar(lms):
+    """Plain NumPy EAR/MAR over the LANDMARK_SUBSET layout"""
+    pts = lms[:, :2].astype(np.float64)
+
+    def dist(a, b):
+        return np.linalg.norm(pts[a] - pts[b])
+
+    def ear(e):
+        return (dist(e[1], e[5]) + dist(e[2], e[4])) / (2.0 * dist(e[0], e[3]))
+
+    left = np.arange(0, len(LEFT_EYE_INDICES))
+    right = left + len(LEFT_EYE_INDICES)
+    m = np.arange(len(MOUTH_INDICES)) + 2 * len(LEFT_EYE_INDICES)
+    mar = (dist(m[1], m[7]) + dist(m[2], m[6]) + dist(m[3], m[5])) / (2.0 * dist(m[0], m[4]))
+    return (ear(left) + ear(right)) / 2.0, mar
+
+
+class ComputeEarMarTests(SimpleTestCase):
+    """Test cases for the compute_ear_mar kernel"""
+
+    def setUp(self):
+        """Fixed landmark subset in pixel coordinates"""
+        rng = np.random.default_rng(1234)
+        self.landmarks = (rng.random((len(LANDMARK_SUBSET), 3)) * 400).astype(np.float32)
+        self.expected = _reference_ear_mar(self.landmarks)
+
+    def test_matches_numpy_reference(self):
+        """Test the (possibly JIT-compiled) kernel against plain NumPy"""
+        ear, mar = detection_production.compute_ear_mar(self.landmarks)
+
+        np.testing.assert_allclose((ear, mar), self.expected, rtol=1e-5)
+
+    def test_matches_numpy_reference_without_numba(self):
+        """Test the pure-Python fallback used when numba is not installed"""
+        module = _load_without_numba()
+        self.assertFalse(module.NUMBA_AVAILABLE)
+
+        ear, mar = module.compute_ear_mar(self.landmarks)
+
+        np.testing.assert_allclose((ear, mar), self.expected, rtol=1e-5)
+
+    def test_degenerate_landmarks_use_safe_defaults(self):
+        """Test coincident corners return the safe EAR and zero MAR"""
+        landmarks = np.zeros((len(LANDMARK_SUBSET), 3), dtype=np.float32)
+
+        ear, mar = detection_production.compute_ear_mar(landmarks)
+
+        self.assertAlmostEqual(ear, 0.3)
+        self.assertEqual(mar, 0.0)
+
+
+class DrawBannerTests(SimpleTestCase):
+    """Test cases for the cached text banner blit"""
+
+    CASES = [
+        ("DEMO MODE - Production Environment", (10, 30), 0.6, (0, 255, 255), 2),
+        ("DROWSINESS DETECTED!", (10, 70), 0.8, (0, 0, 255), 2),
+        ("YAWNING DETECTED!", (10, 110), 0.8, (0, 165, 255), 2),
+        ("Detector: OpenCV", (10, 30), 0.6, (255, 255, 255), 1),
+        # Clipped at the left/top and at the right/bottom edges
+        ("DROWSY DETECTED!", (-20, 5), 0.8, (0, 0, 255), 2),
+        ("ALERT", (600, 478), 0.8, (0, 255, 0), 2),
+    ]
+
+    def test_matches_put_text_pixels(self):
+        """Test the blit leaves exactly the pixels cv2.putText would"""
+        rng = np.random.default_rng(42)
+        background = rng.integers(0, 256, (480, 640, 3), dtype=np.uint8)
+
+        for text, origin, scale, color, thickness in self.CASES:
+            with self.subTest(text=text, origin=origin):
+                expected = background.copy()
+                cv2.putText(expected, text, origin, cv2.FONT_HERSHEY_SIMPLEX,
+                            scale, color, thickness)
+                actual = background.copy()
+
+                _draw_banner(actual, text, origin, scale, color, thickness)
+
+                np.testing.assert_array_equal(actual, expected)
+
+
+class MeshInputTests(SimpleTestCase):
+    """Test cases for the reused Face Mesh input buffer"""
+
+    def test_mesh_input_reuses_scratch_buffer(self):
+        """Test frames of any size are prepared in the same scratch buffer"""
+        detector = ProductionDetector()
+        scratch = detector._rgb_scratch
+        rng = np.random.default_rng(7)
+
+        for shape in ((480, 640, 3), (720, 1280, 3)):
+            with self.subTest(shape=shape):
+                frame = rng.integers(0, 256, shape, dtype=np.uint8)
+                expected = cv2.cvtColor(
+                    cv2.resize(frame, detector.MESH_INPUT_SIZE, interpolation=cv2.INTER_AREA),
+                    cv2.COLOR_BGR2RGB
+                )
+
+                rgb = detector._mesh_input(frame, scratch)
+
+                self.assertIs(rgb, scratch)
+                np.testing.assert_array_equal(rgb, expected)
+
+
+class DemoOverlayTests(SimpleTestCase):
+    """Test cases for the cached demo overlay"""
+
+    def test_cached_overlay_matches_direct_drawing(self):
+        """Test the blitted overlay equals drawing it straight onto the frame"""
+        detector = ProductionDetector()
+        rng = np.random.default_rng(21)
+
+        for shape in ((480, 640, 3), (720, 1280, 3), (480, 640, 3)):
+            background = rng.integers(0, 256, shape, dtype=np.uint8)
+            for is_drowsy in (False, True):
+                for is_yawning in (False, True):
+                    with self.subTest(shape=shape, drowsy=is_drowsy, yawning=is_yawning):
+                        expected = detector._draw_demo_overlay(
+                            background.copy(), is_drowsy, is_yawning,
+                            ProductionDetector._face_rect(shape)
+                        )
+
+                        actual = detector._annotate_demo_frame(
+                            background.copy(), is_drowsy, is_yawning
+                        )
+
+                        np.testing.assert_array_equal(actual, expected)
+            # One entry per flag combination, for the current size only
+            self.assertEqual(len(detector._overlay_cache), 4)
@@ -0,0 +1,99 @@
+"""
+Unit tests for the detection engine alert dispatch
+"""
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import cv2
+import numpy as np
+from django.test import SimpleTestCase
+
+from ..core import detection_engine
+from ..core.detection_engine import DetectionEngine
+
+
+class AlertCooldownTests(SimpleTestCase):
+    """Test cases for alert de-duplication within the cooldown window"""
+
+    def setUp(self):
+        """Engine with a mocked alert service and clock"""
+        self.engine = DetectionEngine()
+        self.profile = Mock()
+        self.profile.user.email = "driver@example.com"
+
+        self.alert_service = Mock()
+        self.alert_service.create_alert = AsyncMock(return_value=Mock())
+        self.alert_service.send_email_alert = AsyncMock()
+        patcher = patch.object(detection_engine, 'alert_service', self.alert_service)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        patcher = patch.object(detection_engine, 'time')
+        self.clock = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def _raise_drowsiness_at(self, *timestamps):
+        """Raise a drowsiness alert at each clock reading, then drain the queue"""
+        self.engine._alert_queue = asyncio.Queue(maxsize=self.engine.ALERT_QUEUE_SIZE)
+        worker = asyncio.create_task(self.engine._alert_worker())
+        try:
+            for ts in timestamps:
+                self.clock.monotonic.return_value = ts
+                await self.engine._handle_drowsiness_alert(self.profile)
+            await self.engine._alert_queue.join()
+        finally:
+            worker.cancel()
+
+    def test_repeat_inside_cooldown_is_dropped(self):
+        """Test a second alert within the cooldown is not sent"""
+        cooldown = self.engine.ALERT_COOLDOWN_SECONDS
+
+        asyncio.run(self._raise_drowsiness_at(1000.0, 1000.0 + cooldown / 2))
+
+        self.assertEqual(self.alert_service.create_alert.await_count, 1)
+        self.assertEqual(self.alert_service.send_email_alert.await_count, 1)
+
+    def test_repeat_after_cooldown_is_sent(self):
+        """Test an alert after the cooldown has elapsed is sent again"""
+        cooldown = self.engine.ALERT_COOLDOWN_SECONDS
+
+        asyncio.run(self._raise_drowsiness_at(
+            1000.0, 1000.0 + cooldown / 2, 1000.0 + cooldown + 1
+        ))
+
+        self.assertEqual(self.alert_service.create_alert.await_count, 2)
+        self.assertEqual(self.alert_service.send_email_alert.await_count, 2)
+
+
+class DetectPreprocessingTests(SimpleTestCase):
+    """Test cases for the grayscale hand-off in _detect"""
+
+    def setUp(self):
+        """Engine with a mocked detector and preallocated buffers"""
+        self.engine = DetectionEngine()
+        self.engine.detector = Mock()
+        self.engine._gray_buf = np.empty((48, 64), dtype=np.uint8)
+        self.engine._small_buf = np.empty((24, 32), dtype=np.uint8)
+        self.frame = np.random.default_rng(3).integers(0, 256, (48, 64, 3), dtype=np.uint8)
+
+    def test_gray_frames_passed_when_used(self):
+        """Test gray and half-size frames are computed for detectors that use them"""
+        self.engine.detector.uses_gray = True
+
+        self.engine._detect(self.frame)
+
+        _, kwargs = self.engine.detector.detect_drowsiness.call_args
+        np.testing.assert_array_equal(
+            kwargs['gray'], cv2.cvtColor(self.frame, cv2.COLOR_BGR2GRAY)
+        )
+        self.assertEqual(kwargs['small'].shape, (24, 32))
+
+    def test_gray_frames_skipped_when_unused(self):
+        """Test no conversion is done for detectors that ignore gray frames"""
+        self.engine.detector.uses_gray = False
+
+        with patch.object(detection_engine.cv2, 'cvtColor') as cvt_color:
+            self.engine._detect(self.frame)
+
+        cvt_color.assert_not_called()
+        self.engine.detector.detect_drowsiness.assert_called_once_with(self.frame)
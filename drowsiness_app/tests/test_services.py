@@ -2,13 +2,16 @@
 Unit tests for service layer
 """
 import pytest
-from django.test import TestCase
+from django.test import TestCase, SimpleTestCase, override_settings
 from django.contrib.auth import get_user_model
-from unittest.mock import patch, MagicMock
+from django.core.mail import EmailMessage
+from unittest.mock import patch, MagicMock, AsyncMock
 import asyncio
 
+import aiosmtplib
+
 from ..services.user_service import user_service
-from ..services.alert_service import alert_service
+from ..services.alert_service import alert_service, AlertService
 from ..services.detection_service import detection_service
 from ..models import DriverProfile, Alert, UserSettings
 from ..core.exceptions import ValidationError, CameraError
@@ -189,6 +192,67 @@ class AlertServiceTests(TestCase):
         asyncio.run(run_test())
 
 
+class AlertSmtpConnectionTests(SimpleTestCase):
+    """Test cases for the persistent aiosmtplib connection"""
+    
+    def setUp(self):
+        """Fresh service with aiosmtplib.SMTP mocked out"""
+        self.service = AlertService()
+        self.email = EmailMessage("Alert", "body", to=["driver@example.com"])
+        self.clients = []
+        # send_message side effects for the next connections, oldest first
+        self.send_errors = []
+        
+        patcher = patch.object(aiosmtplib, 'SMTP', side_effect=self._make_client)
+        self.smtp_class = patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def _make_client(self, **kwargs):
+        """Stand-in for aiosmtplib.SMTP(...)"""
+        client = MagicMock()
+        client.is_connected = True
+        client.connect = AsyncMock()
+        client.login = AsyncMock()
+        error = self.send_errors.pop(0) if self.send_errors else None
+        client.send_message = AsyncMock(side_effect=error)
+        self.clients.append(client)
+        return client
+    
+    async def _send(self, count):
+        for _ in range(count):
+            await self.service._send_smtp(self.email)
+    
+    @override_settings(EMAIL_USE_TLS=False, EMAIL_USE_SSL=True)
+    def test_connection_reused_across_sends(self):
+        """Test one implicit-TLS connection serves consecutive alerts"""
+        asyncio.run(self._send(2))
+        
+        self.assertEqual(len(self.clients), 1)
+        self.assertTrue(self.smtp_class.call_args.kwargs['use_tls'])
+        self.assertEqual(self.clients[0].send_message.await_count, 2)
+    
+    def test_reconnects_once_after_server_disconnect(self):
+        """Test a dropped connection is closed and the alert sent on a new one"""
+        self.send_errors.append(aiosmtplib.SMTPServerDisconnected("gone"))
+        
+        asyncio.run(self._send(1))
+        
+        dropped, fresh = self.clients
+        dropped.close.assert_called_once()
+        self.assertEqual(dropped.send_message.await_count, 1)
+        fresh.send_message.assert_awaited_once()
+    
+    def test_connection_from_previous_loop_is_closed(self):
+        """Test a connection opened on another event loop is closed, not leaked"""
+        asyncio.run(self._send(1))
+        asyncio.run(self._send(1))
+        
+        stale, fresh = self.clients
+        stale.close.assert_called_once()
+        fresh.close.assert_not_called()
+        fresh.send_message.assert_awaited_once()
+
+
 class DetectionServiceTests(TestCase):
     """Test cases for DetectionService"""
     
@@ -0,0 +1,115 @@
+"""
+Unit tests for the detection task pipeline helpers
+"""
+import smtplib
+import threading
+import time
+from unittest.mock import Mock, patch
+
+from django.core.mail import EmailMessage
+from django.test import SimpleTestCase
+
+from .. import tasks_fixed
+from ..tasks_fixed import LatestFrame, _get_batch, BATCH_TIMEOUT_SECONDS
+
+
+class LatestFrameTests(SimpleTestCase):
+    """Test cases for the single-slot frame buffer"""
+
+    def test_slow_consumer_only_sees_newest_frame(self):
+        """Test frames published before a take are replaced, not queued"""
+        slot = LatestFrame()
+        for frame in ("frame-1", "frame-2", "frame-3"):
+            slot.put(frame)
+
+        self.assertEqual(slot.take(0), "frame-3")
+        self.assertIsNone(slot.take(0.01))
+
+    def test_take_times_out_without_new_frame(self):
+        """Test take returns None when nothing arrives in time"""
+        slot = LatestFrame()
+
+        self.assertIsNone(slot.take(0.01))
+
+    def test_end_wakes_waiting_consumer(self):
+        """Test end() releases a consumer blocked in take"""
+        slot = LatestFrame()
+        threading.Timer(0.05, slot.end).start()
+
+        started = time.monotonic()
+        self.assertIsNone(slot.take(5))
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertTrue(slot.ended)
+
+
+class GetBatchTests(SimpleTestCase):
+    """Test cases for _get_batch"""
+
+    def test_returns_early_on_stop_event(self):
+        """Test an idle wait ends as soon as the stop event is set"""
+        slot = LatestFrame()
+        stop = threading.Event()
+        threading.Timer(0.05, stop.set).start()
+
+        started = time.monotonic()
+        frames, ended = _get_batch(slot, stop)
+
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(frames, [])
+        self.assertTrue(ended)
+
+    def test_partial_batch_flushes_after_timeout(self):
+        """Test a lone frame is returned once the batch timeout passes"""
+        slot = LatestFrame()
+        slot.put("frame")
+
+        started = time.monotonic()
+        frames, ended = _get_batch(slot, threading.Event())
+        elapsed = time.monotonic() - started
+
+        self.assertEqual(frames, ["frame"])
+        self.assertFalse(ended)
+        self.assertGreaterEqual(elapsed, BATCH_TIMEOUT_SECONDS * 0.9)
+        self.assertLess(elapsed, BATCH_TIMEOUT_SECONDS + 1)
+
+
+class SharedMailConnectionTests(SimpleTestCase):
+    """Test cases for _send_on_shared_connection"""
+
+    def setUp(self):
+        """Fresh shared connection slot with get_connection mocked"""
+        patcher = patch.object(tasks_fixed, '_mail_connection', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.connection = Mock()
+        patcher = patch.object(tasks_fixed, 'get_connection', return_value=self.connection)
+        self.get_connection = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _email(self):
+        return EmailMessage("Alert", "body", to=["driver@example.com"])
+
+    def test_connection_opened_once_and_reused(self):
+        """Test consecutive alerts share one opened connection"""
+        self.connection.send_messages.return_value = 1
+
+        tasks_fixed._send_on_shared_connection(self._email())
+        tasks_fixed._send_on_shared_connection(self._email())
+
+        self.get_connection.assert_called_once()
+        self.connection.open.assert_called_once()
+        self.assertEqual(self.connection.send_messages.call_count, 2)
+
+    def test_reopens_after_server_disconnect(self):
+        """Test a dropped connection is reopened and the mail sent exactly once"""
+        self.connection.send_messages.side_effect = [
+            smtplib.SMTPServerDisconnected("gone"), 1
+        ]
+
+        sent = tasks_fixed._send_on_shared_connection(self._email())
+
+        self.assertEqual(sent, 1)
+        self.connection.close.assert_called_once()
+        self.assertEqual(self.connection.open.call_count, 2)
+        self.assertEqual(self.connection.send_messages.call_count, 2)
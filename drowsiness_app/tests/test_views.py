@@ -8,6 +8,7 @@ from django.contrib.auth import get_user_model
 from unittest.mock import patch, AsyncMock
 
 from ..models import DriverProfile, UserSettings, Alert
+from ..utils.frame_stream import frame_stream
 
 
 User = get_user_model()
@@ -329,4 +330,88 @@ class MonitoringViewTests(TestCase):
         
         data = json.loads(response.content)
         self.assertFalse(data['success'])
-        self.assertIn('Invalid action', data['message'])
\ No newline at end of file
+        self.assertIn('Invalid action', data['message'])
+
+
+
+class VideoFeedViewTests(TestCase):
+    """Test cases for the MJPEG video feed"""
+    
+    def setUp(self):
+        """Set up a logged-in user"""
+        self.client = Client()
+        self.user = User.objects.create_user(
+            username="feed@example.com",
+            email="feed@example.com",
+            password="testpass123"
+        )
+        self.client.force_login(self.user)
+    
+    def tearDown(self):
+        """Leave the process-wide stream closed for other tests"""
+        frame_stream.stop()
+    
+    def test_video_feed_requires_active_monitoring(self):
+        """Test video feed returns 404 when monitoring is not running"""
+        response = self.client.get(reverse('video_feed'))
+        
+        self.assertEqual(response.status_code, 404)
+        
+        data = json.loads(response.content)
+        self.assertFalse(data['success'])
+    
+    def test_video_feed_streams_published_frames(self):
+        """Test video feed streams the published frame as an MJPEG part"""
+        frame_stream.start(self.user.pk)
+        frame_stream.publish(b"jpeg-bytes")
+        
+        response = self.client.get(reverse('video_feed'))
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('multipart/x-mixed-replace'))
+        
+        content = iter(response.streaming_content)
+        part = next(content)
+        self.assertTrue(part.startswith(b'--frame'))
+        self.assertIn(b"jpeg-bytes", part)
+        
+        # Stopping the stream ends the response
+        frame_stream.stop()
+        self.assertEqual(list(content), [])
+        response.close()
+        self.assertEqual(frame_stream.clients, 0)
+    
+    def test_video_feed_hidden_from_other_users(self):
+        """Test another user cannot watch a stream they don't own"""
+        other = User.objects.create_user(
+            username="other@example.com",
+            email="other@example.com",
+            password="testpass123"
+        )
+        frame_stream.start(other.pk)
+        frame_stream.publish(b"jpeg-bytes")
+        
+        response = self.client.get(reverse('video_feed'))
+        
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(frame_stream.clients, 0)
+    
+    def test_video_feed_limits_concurrent_viewers(self):
+        """Test viewers beyond MAX_CLIENTS are turned away"""
+        frame_stream.start(self.user.pk)
+        frame_stream.publish(b"jpeg-bytes")
+        
+        responses = [
+            self.client.get(reverse('video_feed'))
+            for _ in range(frame_stream.MAX_CLIENTS)
+        ]
+        rejected = self.client.get(reverse('video_feed'))
+        
+        self.assertEqual(rejected.status_code, 503)
+        
+        # Finished responses give their slots back
+        frame_stream.stop()
+        for response in responses:
+            self.assertEqual(response.status_code, 200)
+            list(response.streaming_content)
+        self.assertEqual(frame_stream.clients, 0)
@@ -0,0 +1,38 @@
+"""
+Tests for the WSGI entry point
+"""
+import json
+from unittest.mock import Mock, patch
+
+from django.test import SimpleTestCase
+
+from drowsiness_project import wsgi
+
+
+class HealthCheckFastPathTests(SimpleTestCase):
+    """Test cases for the /health/ fast path in wsgi.application"""
+
+    def test_health_check_skips_django(self):
+        """Test /health/ is answered without invoking Django"""
+        start_response = Mock()
+
+        with patch.object(wsgi, 'django_application') as django_app:
+            body = wsgi.application({'PATH_INFO': '/health/'}, start_response)
+
+        django_app.assert_not_called()
+        status, headers = start_response.call_args[0]
+        self.assertEqual(status, '200 OK')
+        self.assertIn(('Content-Type', 'application/json'), headers)
+        self.assertEqual(json.loads(b''.join(body)), {'status': 'healthy'})
+
+    def test_other_paths_reach_django(self):
+        """Test every other path is handed to the Django application"""
+        environ = {'PATH_INFO': '/dashboard/'}
+        start_response = Mock()
+
+        with patch.object(wsgi, 'django_application', return_value=[b'page']) as django_app:
+            body = wsgi.application(environ, start_response)
+
+        django_app.assert_called_once_with(environ, start_response)
+        start_response.assert_not_called()
+        self.assertEqual(body, [b'page'])
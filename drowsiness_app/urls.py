@@ -22,6 +22,7 @@ urlpatterns = [
     
     # Monitoring - FIXED VERSIONS
     path('toggle-monitoring/', monitoring_views.toggle_monitoring, name='toggle_monitoring'),
+    path('video-feed/', views.video_feed, name='video_feed'),
     path('monitoring-status/', monitoring_views.get_monitoring_status, name='monitoring_status'),
     
     # Additional monitoring endpoints
@@ -21,5 +21,6 @@ urlpatterns = [
     
     # Monitoring
     path('toggle-monitoring/', views.toggle_monitoring, name='toggle_monitoring'),
+    path('video-feed/', views.video_feed, name='video_feed'),
     path('monitoring-status/', views.get_monitoring_status, name='monitoring_status'),
 ]
\ No newline at end of file
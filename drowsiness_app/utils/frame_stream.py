@@ -0,0 +1,180 @@
+"""
+Frame Stream - latest annotated frame shared with MJPEG clients
+"""
+import logging
+import threading
+
+import cv2
+try:
+    from turbojpeg import TurboJPEG, TJSAMP_420
+    TURBOJPEG_AVAILABLE = True
+except ImportError:
+    TURBOJPEG_AVAILABLE = False
+
+
+logger = logging.getLogger(__name__)
+
+
+class FrameStream:
+    """
+    Latest-frame broadcast from the detection pipeline to /video-feed/
+    The pipeline replaces the current JPEG; each client waits for a frame
+    newer than the last one it sent, so a slow client skips frames instead
+    of queueing them. Everything is plain threading, because the feed is
+    served by WSGI worker threads, not an event loop
+    """
+
+    JPEG_QUALITY = 70
+
+    # Clients wake up this often to notice a stopped stream
+    WAIT_SECONDS = 1.0
+
+    # Concurrent viewers; keep well below gunicorn's --threads so the feed
+    # can't starve ordinary requests
+    MAX_CLIENTS = 2
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._jpeg = None
+        self._seq = 0
+        self.active = False
+        self.clients = 0
+        # Primary key of the user whose camera is being streamed
+        self.owner_id = None
+        # SIMD JPEG encoder, created on first use (None -> cv2.imencode)
+        self._tj = None
+        self._tj_lock = threading.Lock()
+        self._tj_checked = False
+
+    def start(self, owner_id):
+        """
+        Open the stream for a new monitoring session
+        Args:
+            owner_id: Primary key of the monitored user; only they may watch
+        """
+        with self._cond:
+            self._jpeg = None
+            self.owner_id = owner_id
+            self.active = True
+
+    def is_watchable_by(self, user):
+        """True if the stream is live and belongs to `user`"""
+        return self.active and self.owner_id is not None and self.owner_id == user.pk
+
+    def stop(self):
+        """Close the stream and release all waiting clients"""
+        with self._cond:
+            self.active = False
+            self.owner_id = None
+            self._cond.notify_all()
+
+    def publish(self, jpeg):
+        """Replace the current frame with an encoded JPEG"""
+        with self._cond:
+            self._jpeg = jpeg
+            self._seq += 1
+            self._cond.notify_all()
+
+    def _encoder(self):
+        """Return the libjpeg-turbo encoder, or None to use cv2.imencode"""
+        with self._tj_lock:
+            if not self._tj_checked:
+                self._tj_checked = True
+                if not TURBOJPEG_AVAILABLE:
+                    logger.info("PyTurboJPEG not available - using cv2.imencode")
+                else:
+                    try:
+                        self._tj = TurboJPEG()
+                    except Exception as e:
+                        # Python package present but libturbojpeg missing
+                        logger.warning(f"TurboJPEG initialization failed: {e}")
+            return self._tj
+
+    def encode(self, frame):
+        """
+        Encode a BGR frame as JPEG
+        Returns: JPEG bytes, or None if encoding failed
+        """
+        tj = self._encoder()
+        if tj is not None:
+            return tj.encode(frame, quality=self.JPEG_QUALITY, jpeg_subsample=TJSAMP_420)
+
+        ok, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, self.JPEG_QUALITY])
+        return buffer.tobytes() if ok else None
+
+    def publish_frame(self, frame):
+        """Encode and publish a BGR frame; skipped when nobody is watching"""
+        if not self.clients:
+            return
+        jpeg = self.encode(frame)
+        if jpeg is not None:
+            self.publish(jpeg)
+
+    def subscribe(self):
+        """
+        Register an MJPEG viewer
+        Every viewer holds a WSGI worker thread for as long as it stays
+        connected, so at most MAX_CLIENTS are admitted
+        Returns: Sync iterator for StreamingHttpResponse, or None when full
+        """
+        with self._cond:
+            if self.clients >= self.MAX_CLIENTS:
+                return None
+            self.clients += 1
+        return _Viewer(self)
+
+    def _unsubscribe(self):
+        """Release a viewer slot"""
+        with self._cond:
+            self.clients -= 1
+
+    def _next_jpeg(self, seen):
+        """
+        Wait for a frame newer than sequence number `seen`
+        Returns: (seq, jpeg), or None once the stream has stopped
+        """
+        with self._cond:
+            while True:
+                self._cond.wait_for(
+                    lambda: not self.active or (self._seq != seen and self._jpeg is not None),
+                    self.WAIT_SECONDS
+                )
+                if not self.active:
+                    return None
+                if self._seq != seen and self._jpeg is not None:
+                    return self._seq, self._jpeg
+
+
+class _Viewer:
+    """One MJPEG client of a FrameStream; close() frees its slot"""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._seen = 0
+        self._closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        latest = None if self._closed else self._stream._next_jpeg(self._seen)
+        if latest is None:
+            self.close()
+            raise StopIteration
+        self._seen, jpeg = latest
+        return (
+            b'--frame\r\n'
+            b'Content-Type: image/jpeg\r\n\r\n' + jpeg + b'\r\n'
+        )
+
+    def close(self):
+        """Called by Django when the response finishes or the client leaves"""
+        if not self._closed:
+            self._closed = True
+            self._stream._unsubscribe()
+
+
+# Process-wide stream; the monitoring views only run one session at a time.
+# Monitoring state (this stream, the capture thread) lives in the serving
+# process, which is why gunicorn runs a single worker (see Procfile)
+frame_stream = FrameStream()
@@ -26,6 +26,8 @@ logger = logging.getLogger(__name__)
 # Global variable to track monitoring thread
 monitoring_thread = None
 monitoring_active = False
+# Set to end the running detection task
+monitoring_stop = None
 
 
 @login_required
@@ -58,7 +60,7 @@ def toggle_monitoring(request):
 
 def start_monitoring_sync(request):
     """Start monitoring process - SYNCHRONOUS VERSION THAT WORKS"""
-    global monitoring_thread, monitoring_active
+    global monitoring_thread, monitoring_active, monitoring_stop
     
     try:
         # Check if already monitoring
@@ -118,6 +120,9 @@ def start_monitoring_sync(request):
                 monitoring_active = False
         
         # Start the detection in a background thread
+        monitoring_stop = threading.Event()
+        stop_event = monitoring_stop
+
         def run_detection():
             global monitoring_active
             monitoring_active = True
@@ -129,7 +134,8 @@ def start_monitoring_sync(request):
                     ear_frames=ear_frames,
                     yawn_thresh=yawn_thresh,
                     driver_profile=driver_profile,
-                    driver_email=driver_email
+                    driver_email=driver_email,
+                    stop_event=stop_event
                 )
             except Exception as e:
                 logger.error(f"Detection task failed: {e}")
@@ -161,7 +167,7 @@ def start_monitoring_sync(request):
 
 def stop_monitoring_sync(request):
     """Stop monitoring process - SYNCHRONOUS VERSION"""
-    global monitoring_thread, monitoring_active
+    global monitoring_thread, monitoring_active, monitoring_stop
     
     try:
         if not monitoring_active:
@@ -172,6 +178,8 @@ def stop_monitoring_sync(request):
         
         # Signal to stop monitoring
         monitoring_active = False
+        if monitoring_stop is not None:
+            monitoring_stop.set()
         
         # Close any OpenCV windows
         import cv2
@@ -9,7 +9,7 @@ from django.contrib.auth import login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.shortcuts import render, redirect
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt, csrf_protect
 from django.views.decorators.http import require_http_methods
 from asgiref.sync import async_to_sync
@@ -20,6 +20,7 @@ from .services.detection_service import detection_service
 from .services.alert_service import alert_service
 from .core.detection_engine import create_detection_engine
 from .core.exceptions import ValidationError, DetectionError, CameraError
+from .utils.frame_stream import frame_stream
 
 
 logger = logging.getLogger(__name__)
@@ -317,6 +318,8 @@ async def _start_monitoring(request):
                 driver_profile, 
                 user_settings.get_detection_config()
             ))
+            detection_service.engine = detection_engine
+            detection_service.current_task = task
             request.session['monitoring_task_id'] = id(task)
             
             logger.info(f"Monitoring started for: {request.user.email}")
@@ -392,6 +395,31 @@ def get_monitoring_status(request):
         }, status=500)
 
 
+@login_required
+def video_feed(request):
+    """Stream annotated monitoring frames as MJPEG"""
+    # Frames are published by whichever pipeline is running in this
+    # process (tasks_fixed via toggle-monitoring/, or the DetectionEngine).
+    # Someone else's session looks the same as no session
+    if not frame_stream.is_watchable_by(request.user):
+        return JsonResponse({
+            "success": False,
+            "message": "Monitoring is not currently active."
+        }, status=404)
+    
+    viewer = frame_stream.subscribe()
+    if viewer is None:
+        return JsonResponse({
+            "success": False,
+            "message": "Too many open video feeds. Close another viewer and retry."
+        }, status=503)
+    
+    return StreamingHttpResponse(
+        viewer,
+        content_type='multipart/x-mixed-replace; boundary=frame'
+    )
+
+
 def logout_view(request):
     """User logout view"""
     email = request.user.email if request.user.is_authenticated else "Unknown"
@@ -2,6 +2,7 @@
 Production settings for DrowsiSense deployment on Railway
 """
 import os
+import django
 import dj_database_url
 from .settings import *
 
@@ -24,6 +25,19 @@ DATABASES = {
     )
 }
 
+# Cap total PostgreSQL connections with the psycopg3 pool (Django >= 5.1).
+# The pool replaces persistent per-thread connections, so CONN_MAX_AGE is 0.
+if (
+    DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql'
+    and django.VERSION >= (5, 1)
+):
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+        'min_size': 2,
+        'max_size': 4,
+        'timeout': 10,
+    }
+
 # Static files configuration
 STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
@@ -32,6 +46,9 @@ STATICFILES_DIRS = [BASE_DIR / 'static']
 # Use WhiteNoise for static files
 MIDDLEWARE.insert(1, 'whitenoise.middleware.WhiteNoiseMiddleware')
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# Serve the .br/.gz files built by collectstatic with far-future caching
+WHITENOISE_MAX_AGE = 31536000
+WHITENOISE_USE_FINDERS = False
 
 # Security settings
 SECURE_SSL_REDIRECT = not DEBUG
@@ -80,11 +97,20 @@ CORS_ALLOWED_ORIGINS = [
     "https://drowsisense-production.up.railway.app",
 ]
 
-# Cache configuration
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+# Cache configuration - Redis when the Railway Redis plugin injects
+# REDIS_URL; otherwise keep Django's local-memory cache and database
+# sessions, so a missing Redis can't break every request
+REDIS_URL = os.environ.get('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'TIMEOUT': 3600,
+        }
     }
-}
+    
+    # Serve sessions from the cache, falling back to the database
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
 
 print("🚀 Production settings loaded successfully!")
\ No newline at end of file
@@ -0,0 +1,17 @@
+"""
+Test settings for DrowsiSense - SQLite instead of PostgreSQL
+"""
+import os
+import tempfile
+
+from .settings import *
+
+# Without TEST['NAME'], Django runs the test database in memory; each
+# pytest-xdist worker gets its own. NAME is only the scratch database that
+# setup_testing.py migrates
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(tempfile.gettempdir(), 'drowsisense.sqlite'),
+    }
+}
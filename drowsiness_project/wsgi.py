@@ -32,4 +32,20 @@ else:
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
 
-application = get_wsgi_application()
+django_application = get_wsgi_application()
+
+# Railway pings /health/ often - answer it without running the middleware stack
+HEALTH_CHECK_PATH = '/health/'
+HEALTH_CHECK_BODY = b'{"status": "healthy"}'
+HEALTH_CHECK_HEADERS = [
+    ('Content-Type', 'application/json'),
+    ('Content-Length', str(len(HEALTH_CHECK_BODY))),
+]
+
+
+def application(environ, start_response):
+    """WSGI entry point with a health check fast path"""
+    if environ.get('PATH_INFO') == HEALTH_CHECK_PATH:
+        start_response('200 OK', HEALTH_CHECK_HEADERS)
+        return [HEALTH_CHECK_BODY]
+    return django_application(environ, start_response)